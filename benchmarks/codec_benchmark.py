@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encode/decode cost per tool response.
+
+Compares the standard library encoder with orjson (when installed) on
+representative payloads for each tool, wrapped in a JSON-RPC envelope the
+way the WebSocket transport sends them.
+
+Usage:
+    python benchmarks/codec_benchmark.py [--readings 10000] [--repeat 20] [--json]
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TOOLS_FILE = Path(__file__).resolve().parent.parent / "fledge_mcp" / "smithery.json"
+
+
+def sensor_readings(count):
+    """Fledge-style readings for get_sensor_data."""
+    now = datetime.now()
+    return [
+        {"reading": {"value": random.uniform(20, 30), "humidity": random.uniform(40, 60)},
+         "timestamp": str(now - timedelta(seconds=i))}
+        for i in range(count)
+    ]
+
+
+def payloads(readings):
+    """Representative result payloads keyed by tool name."""
+    with open(TOOLS_FILE) as f:
+        tools = json.load(f)["tools"]
+    return {
+        "tools/list": {"tools": tools},
+        "get_sensor_data": sensor_readings(readings),
+        "get_latest_reading": sensor_readings(1)[0],
+        "list_sensors": [{"assetCode": f"sensor_{i}", "count": random.randint(1, 10**6)} for i in range(500)],
+        "generate_mock_data": [
+            {"timestamp": r["timestamp"], "readings": {"value": r["reading"]["value"]}}
+            for r in sensor_readings(min(readings, 1000))
+        ],
+        "get_api_schema": {"endpoints": ["/asset", "/service", "/south/ingest"]},
+    }
+
+
+def backends():
+    """Encoder/decoder pairs to compare."""
+    available = {"json": (lambda obj: json.dumps(obj).encode("utf-8"), json.loads)}
+    if orjson is not None:
+        available["orjson"] = (orjson.dumps, orjson.loads)
+    return available
+
+
+def measure(func, arg, repeat):
+    """Return the best wall time in microseconds over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6
+
+
+def run(readings, repeat):
+    """Benchmark every backend on every payload."""
+    results = []
+    for tool, result in payloads(readings).items():
+        message = {"jsonrpc": "2.0", "result": result, "id": 1}
+        for name, (dumps, loads) in backends().items():
+            encoded = dumps(message)
+            results.append({
+                "tool": tool,
+                "backend": name,
+                "bytes": len(encoded),
+                "encode_us": round(measure(dumps, message, repeat), 1),
+                "decode_us": round(measure(loads, encoded, repeat), 1),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON codecs per tool response")
+    parser.add_argument("--readings", type=int, default=10000, help="Readings in the get_sensor_data payload")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.readings, args.repeat)
+    if args.json:
+        json.dump({"orjson_available": orjson is not None, "results": results}, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"{'tool':<22}{'backend':<9}{'bytes':>11}{'encode us':>12}{'decode us':>12}")
+    for row in results:
+        print(f"{row['tool']:<22}{row['backend']:<9}{row['bytes']:>11}{row['encode_us']:>12}{row['decode_us']:>12}")
+    if orjson is None:
+        print("\norjson is not installed; only the standard library was measured.")
+
+
+if __name__ == "__main__":
+    main()
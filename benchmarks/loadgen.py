@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+End-to-end load generator for the WebSocket MCP server.
+
+Starts the mock Fledge API and ``fledge_mcp.main`` as subprocesses (unless
+``--url``/``--fledge-api`` point at running ones), opens N concurrent
+WebSocket clients and drives a weighted mix of ``initialize``, ``tools/list``
+and ``tools/call`` requests for a fixed duration. Reports throughput,
+p50/p95/p99 latency and error rate per request type, and the server's RSS.
+
+Usage:
+    python benchmarks/loadgen.py [--clients 50] [--duration 10] [--in-flight 1]
+        [--mix "tools/list=1,get_sensor_data=4"] [--json results.json] [--compare baseline.json]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import websockets
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fledge_mcp import codec  # noqa: E402
+
+DEFAULT_MIX = "initialize=1,tools/list=1,get_sensor_data=4,get_latest_reading=2,list_sensors=1,get_service_status=1"
+
+
+def tool_params(tool, rng, assets):
+    """Parameters for a tools/call of tool."""
+    sensor_id = f"sensor_{rng.randrange(max(assets, 1))}"
+    return {
+        "get_sensor_data": {"sensor_id": sensor_id, "limit": 100},
+        "get_latest_reading": {"sensor_id": sensor_id},
+        "generate_mock_data": {"sensor_id": sensor_id, "count": 1000, "format": "columnar"},
+        "ingest_test_data": {"sensor_id": sensor_id, "value": rng.uniform(20, 30), "count": 1},
+    }.get(tool, {})
+
+
+def parse_mix(text):
+    """Parse "label=weight,..." into (labels, weights)."""
+    labels, weights = [], []
+    for item in text.split(","):
+        label, _, weight = item.strip().partition("=")
+        labels.append(label)
+        weights.append(float(weight or 1))
+    return labels, weights
+
+
+def build_request(label, msg_id, rng, assets):
+    """JSON-RPC request for a mix label: a method name or a tool name."""
+    if label in ("initialize", "tools/list"):
+        return {"jsonrpc": "2.0", "method": label, "params": {}, "id": msg_id}
+    params = {"name": label, "parameters": tool_params(label, rng, assets)}
+    return {"jsonrpc": "2.0", "method": "tools/call", "params": params, "id": msg_id}
+
+
+class Results:
+    """Latencies and errors per mix label."""
+
+    def __init__(self, labels):
+        self.latencies = {label: [] for label in labels}
+        self.errors = {label: 0 for label in labels}
+        self.connect_errors = 0
+
+    def record(self, label, seconds, ok):
+        self.latencies[label].append(seconds)
+        if not ok:
+            self.errors[label] += 1
+
+
+async def run_client(url, deadline, labels, weights, results, in_flight, assets, seed, timeout):
+    """One WebSocket connection keeping in_flight requests outstanding until the deadline."""
+    rng = random.Random(seed)
+    pending = {}
+    try:
+        websocket = await websockets.connect(url, max_size=None)
+    except (OSError, websockets.exceptions.WebSocketException):
+        results.connect_errors += 1
+        return
+
+    async def reader():
+        async for message in websocket:
+            data = codec.loads(message)
+            for response in data if isinstance(data, list) else [data]:
+                future = pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+
+    async def lane(lane_id):
+        counter = 0
+        while time.perf_counter() < deadline:
+            label = rng.choices(labels, weights)[0]
+            msg_id = f"{seed}-{lane_id}-{counter}"
+            counter += 1
+            future = asyncio.get_running_loop().create_future()
+            pending[msg_id] = future
+            started = time.perf_counter()
+            try:
+                await websocket.send(codec.dumps_text(build_request(label, msg_id, rng, assets)))
+                response = await asyncio.wait_for(future, timeout)
+                ok = "error" not in response
+            except (asyncio.TimeoutError, websockets.exceptions.ConnectionClosed):
+                pending.pop(msg_id, None)
+                ok = False
+            results.record(label, time.perf_counter() - started, ok)
+            if websocket.closed:
+                return
+
+    reader_task = asyncio.create_task(reader())
+    try:
+        await asyncio.gather(*(lane(i) for i in range(in_flight)))
+    finally:
+        reader_task.cancel()
+        await websocket.close()
+
+
+def read_rss_kb(pid):
+    """Resident set size of pid and its descendants (e.g. workers) in KiB, or None without /proc."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            rss = next((int(line.split()[1]) for line in f if line.startswith("VmRSS:")), 0)
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(child) for child in f.read().split()]
+    except OSError:
+        return None
+    return rss + sum(read_rss_kb(child) or 0 for child in children)
+
+
+async def sample_rss(pid, samples, stop):
+    """Record the server's RSS every 200ms until stop is set."""
+    while not stop.is_set():
+        rss = read_rss_kb(pid)
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.2)
+        except asyncio.TimeoutError:
+            pass
+
+
+def free_port():
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port, timeout=15):
+    """Wait until something accepts connections on port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
+
+async def start_processes(args):
+    """Start the mock Fledge API and the MCP server as needed; return (url, server pid, processes)."""
+    processes = []
+    quiet = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL} if not args.verbose else {}
+    fledge_api = args.fledge_api
+    if fledge_api is None:
+        port = free_port()
+        processes.append(subprocess.Popen([
+            sys.executable, "-m", "fledge_mcp.mock_fledge", "--port", str(port),
+            "--assets", str(args.assets), "--readings", str(args.readings),
+            "--latency", str(args.latency), "--seed", "1",
+        ], cwd=ROOT, **quiet))
+        await wait_for_port(port)
+        fledge_api = f"http://127.0.0.1:{port}/fledge"
+    if args.url:
+        return args.url, args.server_pid, processes
+    port, http_port = free_port(), free_port()
+    env = dict(os.environ, FLEDGE_API_URL=fledge_api)
+    # Measure capacity rather than per-client rate limits unless asked to
+    env.setdefault("RATE_LIMIT_RPS", "0")
+    server = subprocess.Popen([
+        sys.executable, "-m", "fledge_mcp.main", "--port", str(port), "--http-port", str(http_port),
+        "--fledge-api", fledge_api, "--log-level", args.server_log_level, "--workers", str(args.workers),
+    ], cwd=ROOT, env=env, **quiet)
+    processes.append(server)
+    await wait_for_port(port)
+    return f"ws://127.0.0.1:{port}", server.pid, processes
+
+
+def percentile_ms(values, q):
+    return round(float(np.percentile(values, q)) * 1000, 3) if values else None
+
+
+def summarize(results, elapsed, rss_samples):
+    """Machine-readable report of a run."""
+    per_label = {}
+    total = errors = 0
+    for label, latencies in results.latencies.items():
+        count = len(latencies)
+        total += count
+        errors += results.errors[label]
+        per_label[label] = {
+            "requests": count,
+            "errors": results.errors[label],
+            "error_rate": round(results.errors[label] / count, 4) if count else None,
+            "throughput": round(count / elapsed, 1),
+            "p50_ms": percentile_ms(latencies, 50),
+            "p95_ms": percentile_ms(latencies, 95),
+            "p99_ms": percentile_ms(latencies, 99),
+        }
+    every = [latency for latencies in results.latencies.values() for latency in latencies]
+    return {
+        "summary": {
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else None,
+            "connect_errors": results.connect_errors,
+            "throughput": round(total / elapsed, 1),
+            "p50_ms": percentile_ms(every, 50),
+            "p95_ms": percentile_ms(every, 95),
+            "p99_ms": percentile_ms(every, 99),
+            "elapsed_seconds": round(elapsed, 3),
+            "server_rss_kb_peak": max(rss_samples) if rss_samples else None,
+            "server_rss_kb_end": rss_samples[-1] if rss_samples else None,
+        },
+        "per_label": per_label,
+    }
+
+
+async def run(args):
+    labels, weights = parse_mix(args.mix)
+    url, server_pid, processes = await start_processes(args)
+    results = Results(labels)
+    rss_samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(server_pid, rss_samples, stop)) if server_pid else None
+    try:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            run_client(url, deadline, labels, weights, results, args.in_flight, args.assets, seed, args.timeout)
+            for seed in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        stop.set()
+        if sampler is not None:
+            await sampler
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+    report = summarize(results, elapsed, rss_samples)
+    report["meta"] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "codec": codec.BACKEND,
+        "git": git_revision(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("json", "compare")},
+    }
+    return report
+
+
+def git_revision():
+    """Short git revision of the tree being measured, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, baseline=None):
+    """Human-readable table, with deltas against a baseline report when given."""
+    header = f"{'request':<22}{'count':>8}{'err %':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header + ("  p95 vs baseline" if baseline else ""))
+    rows = list(report["per_label"].items()) + [("TOTAL", report["summary"])]
+    for label, row in rows:
+        error_pct = f"{row['error_rate'] * 100:.1f}" if row["error_rate"] is not None else "-"
+        line = (f"{label:<22}{row['requests']:>8}{error_pct:>7}{row['throughput']:>9}"
+                f"{str(row['p50_ms']):>9}{str(row['p95_ms']):>9}{str(row['p99_ms']):>9}")
+        if baseline:
+            base = baseline["summary"] if label == "TOTAL" else baseline["per_label"].get(label)
+            if base and base.get("p95_ms") and row["p95_ms"]:
+                line += f"  {(row['p95_ms'] / base['p95_ms'] - 1) * 100:+.1f}%"
+        print(line)
+    summary = report["summary"]
+    if summary["server_rss_kb_peak"] is not None:
+        print(f"\nserver RSS: peak {summary['server_rss_kb_peak']} KiB, end {summary['server_rss_kb_end']} KiB")
+    if summary["connect_errors"]:
+        print(f"{summary['connect_errors']} clients failed to connect")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the WebSocket MCP server")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent WebSocket connections")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to generate load for")
+    parser.add_argument("--in-flight", type=int, default=1, help="Outstanding requests per connection")
+    parser.add_argument("--mix", type=str, default=DEFAULT_MIX, help="Weighted request mix: label=weight,...")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds before a request counts as failed")
+    parser.add_argument("--url", type=str, help="Target an already running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="PID of the --url server, for RSS sampling")
+    parser.add_argument("--fledge-api", type=str, help="Use this Fledge API instead of starting the mock")
+    parser.add_argument("--assets", type=int, default=10, help="Assets in the mock Fledge dataset")
+    parser.add_argument("--readings", type=int, default=1000, help="Readings per asset in the mock dataset")
+    parser.add_argument("--latency", type=float, default=0.002, help="Mock Fledge latency in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes of the started server")
+    parser.add_argument("--server-log-level", type=str, default="WARNING", help="Log level of the started server")
+    parser.add_argument("--verbose", action="store_true", help="Show output of the started processes")
+    parser.add_argument("--json", type=str, help="Write the report as JSON to this file (- for stdout)")
+    parser.add_argument("--compare", type=str, help="Baseline JSON report to compare p95 latency against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Admission control and load shedding for tool calls.
+
+Every tool call passes through the shared controller before its handler runs:
+
+- Each client (WebSocket session or HTTP peer) has a token bucket. A call
+  costs a per-tool number of tokens, so expensive tools such as
+  ``ingest_test_data`` use up a client's budget faster than cheap ones.
+- At most ``max_inflight`` calls run at once, and optionally fewer of a
+  given tool. Calls over those limits wait in a bounded FIFO queue.
+- Calls are rejected immediately, instead of queued, when the queue is
+  full or the event loop is already lagging, so an overloaded server sheds
+  work early rather than letting latency and memory grow.
+
+Rejected calls raise ``ServerBusy`` carrying a reason and a retry hint.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+
+from fledge_mcp import metrics
+
+logger = logging.getLogger("FledgeAdmission")
+
+# Tokens a call consumes from its client's bucket (other tools cost 1)
+DEFAULT_COSTS = {
+    "ingest_test_data": 10.0,
+    "start_stop_service": 10.0,
+    "generate_mock_data": 5.0,
+    "simulate_frontend_request": 2.0,
+}
+
+# Maximum concurrent calls of a tool across all clients (other tools are only globally limited)
+DEFAULT_CONCURRENCY = {
+    "ingest_test_data": 4,
+    "start_stop_service": 1,
+    "generate_mock_data": 4,
+}
+
+DEFAULT_RATE = float(os.getenv("RATE_LIMIT_RPS", "50"))
+DEFAULT_BURST = float(os.getenv("RATE_LIMIT_BURST", "100"))
+DEFAULT_MAX_INFLIGHT = int(os.getenv("MAX_INFLIGHT_CALLS", "64"))
+DEFAULT_MAX_QUEUE = int(os.getenv("ADMISSION_QUEUE_SIZE", "256"))
+DEFAULT_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+DEFAULT_MAX_LAG = float(os.getenv("SHED_LOOP_LAG", "0.5"))
+# Token buckets kept for this many recently seen clients
+MAX_CLIENTS = 10000
+
+
+def parse_limits(spec, defaults):
+    """Parse a "tool=number,tool=number" override string on top of the defaults."""
+    limits = dict(defaults)
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        tool, _, value = item.partition("=")
+        limits[tool.strip()] = float(value)
+    return limits
+
+
+class ServerBusy(Exception):
+    """Raised when a call is not admitted."""
+
+    def __init__(self, reason, message, retry_after=None):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst."""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated = clock()
+
+    def take(self, cost=1.0):
+        """Consume cost tokens; return 0 on success, else seconds until they are available."""
+        cost = min(cost, self.burst)
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Rate limits, concurrency limits and a bounded wait queue for tool calls."""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_inflight=DEFAULT_MAX_INFLIGHT,
+                 max_queue=DEFAULT_MAX_QUEUE, queue_timeout=DEFAULT_QUEUE_TIMEOUT, max_lag=DEFAULT_MAX_LAG,
+                 costs=None, concurrency=None, clock=time.monotonic, lag=metrics.loop_lag.value):
+        self.rate = rate
+        self.burst = burst
+        self.max_inflight = max(1, max_inflight)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_lag = max_lag
+        self.costs = DEFAULT_COSTS if costs is None else costs
+        self.concurrency = DEFAULT_CONCURRENCY if concurrency is None else concurrency
+        self.clock = clock
+        self.lag = lag
+        self.inflight = 0
+        self.inflight_by_tool = {}
+        self._waiters = deque()
+        self._buckets = OrderedDict()
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst, self.clock)
+            if len(self._buckets) > MAX_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def forget(self, key):
+        """Drop the token bucket of a client that went away."""
+        self._buckets.pop(key, None)
+
+    def _can_run(self, tool):
+        limit = self.concurrency.get(tool)
+        return self.inflight < self.max_inflight and (limit is None or self.inflight_by_tool.get(tool, 0) < limit)
+
+    def _start(self, tool):
+        self.inflight += 1
+        self.inflight_by_tool[tool] = self.inflight_by_tool.get(tool, 0) + 1
+
+    def _reject(self, reason, message, retry_after=None):
+        metrics.admission_rejected.inc(reason=reason)
+        logger.warning(f"Rejected tool call: {message}")
+        return ServerBusy(reason, message, retry_after)
+
+    async def acquire(self, key, tool):
+        """Wait for permission to run a call of tool for client key (None: not rate limited)."""
+        lag = self.lag()
+        if self.max_lag > 0 and lag > self.max_lag:
+            raise self._reject("overloaded", f"Server busy: event loop lagging by {lag:.2f}s", 1.0)
+        if key is not None and self.rate > 0:
+            wait = self._bucket(key).take(self.costs.get(tool, 1.0))
+            if wait:
+                raise self._reject("rate_limited", f"Server busy: rate limit exceeded for {tool}", round(wait, 3))
+        if self._can_run(tool):
+            self._start(tool)
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full", "Server busy: too many queued calls", 1.0)
+        future = asyncio.get_running_loop().create_future()
+        entry = (tool, future)
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("queue_timeout", f"Server busy: {tool} waited {self.queue_timeout}s for a slot", 1.0)
+        except BaseException:
+            # A slot granted just before cancellation must be handed on
+            if future.done() and not future.cancelled():
+                self.release(tool)
+            raise
+        finally:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+
+    def release(self, tool):
+        """Finish a call and let queued calls that now fit start."""
+        self.inflight -= 1
+        self.inflight_by_tool[tool] -= 1
+        for entry in list(self._waiters):
+            if self.inflight >= self.max_inflight:
+                break
+            waiting_tool, future = entry
+            if future.done():
+                self._waiters.remove(entry)
+            elif self._can_run(waiting_tool):
+                self._waiters.remove(entry)
+                self._start(waiting_tool)
+                future.set_result(None)
+
+    def stats(self):
+        return {"inflight": self.inflight, "queued": self.queued, "clients": len(self._buckets)}
+
+
+# Shared controller for this process
+admission_controller = AdmissionController(
+    costs=parse_limits(os.getenv("TOOL_COSTS"), DEFAULT_COSTS),
+    concurrency={tool: int(limit) for tool, limit in
+                 parse_limits(os.getenv("TOOL_CONCURRENCY"), DEFAULT_CONCURRENCY).items()},
+)
+
+metrics.registry.gauge("fledge_mcp_admission_queue_depth", "Tool calls waiting for an admission slot",
+                       function=lambda: admission_controller.queued)
@@ -0,0 +1,175 @@
+"""
+Server-side aggregation and downsampling of sensor readings.
+
+Readings fetched for ``get_sensor_data`` can be reduced before they are sent
+to the client: time-bucketed min/max/mean/count, percentiles over the window,
+and Largest-Triangle-Three-Buckets (LTTB) downsampling. Everything is computed
+with NumPy over columnar arrays built once from the upstream readings.
+"""
+
+import numpy as np
+
+from fledge_mcp.timeseries import format_timestamp, parse_timestamp
+
+AGGREGATION_PARAMS = ("buckets", "percentiles", "downsample")
+MAX_BUCKETS = 10000
+
+
+def requested(params):
+    """Return True if the tool parameters ask for any aggregation."""
+    return any(params.get(name) is not None for name in AGGREGATION_PARAMS)
+
+
+def _epoch_seconds(value):
+    """Convert one timestamp (string or epoch seconds) to epoch seconds."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return parse_timestamp(value)
+        except ValueError:
+            pass
+    raise ValueError(f"invalid timestamp: {value!r}")
+
+
+def _to_epoch(stamps):
+    """Convert a timestamp column to epoch seconds; raises ValueError for unparseable values."""
+    # NumPy parses naive strings in bulk; zone offsets, numbers and mixed columns go one by one
+    if all(isinstance(s, str) and not (s.endswith("Z") or "+" in s[10:] or "-" in s[10:]) for s in stamps):
+        try:
+            return np.array(stamps, dtype="datetime64[us]").astype(np.int64) / 1e6
+        except ValueError:
+            pass
+    return np.array([_epoch_seconds(s) for s in stamps], dtype=float)
+
+
+def _to_columns(readings):
+    """Build ascending epoch-second timestamps and one float column per numeric datapoint."""
+    rows = [r for r in readings if isinstance(r, dict) and "timestamp" in r]
+    if not rows:
+        return np.empty(0), {}
+    timestamps = _to_epoch([r["timestamp"] for r in rows])
+
+    values = [r.get("reading", r.get("readings")) or {} for r in rows]
+    columns = {}
+    for name in values[0]:
+        column = [v.get(name) for v in values]
+        if all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in column):
+            columns[name] = np.array(column, dtype=float)
+
+    order = np.argsort(timestamps, kind="stable")
+    return timestamps[order], {name: column[order] for name, column in columns.items()}
+
+
+def _nullable(array):
+    """Convert a float array to a list with NaN replaced by None."""
+    return [None if np.isnan(x) else float(x) for x in array]
+
+
+def bucketize(timestamps, column, buckets):
+    """Return per-bucket min/max/mean/count over equal-width time buckets."""
+    start, end = timestamps[0], timestamps[-1]
+    width = (end - start) / buckets if end > start else 1.0
+    index = np.minimum(((timestamps - start) / width).astype(np.int64), buckets - 1)
+    counts = np.bincount(index, minlength=buckets)
+    sums = np.bincount(index, weights=column, minlength=buckets)
+
+    mins = np.full(buckets, np.nan)
+    maxs = np.full(buckets, np.nan)
+    occupied = np.flatnonzero(counts)
+    # Timestamps are sorted, so each occupied bucket is a contiguous run starting here
+    starts = np.concatenate(([0], np.cumsum(counts[occupied])[:-1]))
+    mins[occupied] = np.minimum.reduceat(column, starts)
+    maxs[occupied] = np.maximum.reduceat(column, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+
+    return {
+        "min": _nullable(mins),
+        "max": _nullable(maxs),
+        "mean": _nullable(means),
+        "count": counts.tolist(),
+    }, start + width * np.arange(buckets)
+
+
+def lttb(x, y, threshold):
+    """Return the indices selected by Largest-Triangle-Three-Buckets downsampling."""
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[edges[i + 1]:edges[i + 2]].mean()
+            next_y = y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (next_y - y[previous])
+        )
+        previous = lo + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def validate(params):
+    """Raise ValueError if the aggregation parameters are malformed."""
+    buckets = params.get("buckets")
+    percentiles = params.get("percentiles")
+    downsample = params.get("downsample")
+    if buckets is not None and not (isinstance(buckets, int) and 0 < buckets <= MAX_BUCKETS):
+        raise ValueError(f"buckets must be an integer between 1 and {MAX_BUCKETS}")
+    if downsample is not None and not (isinstance(downsample, int) and downsample >= 3):
+        raise ValueError("downsample must be an integer >= 3")
+    if percentiles is not None:
+        if not isinstance(percentiles, list) or not all(
+                isinstance(q, (int, float)) and 0 <= q <= 100 for q in percentiles):
+            raise ValueError("percentiles must be a list of numbers between 0 and 100")
+
+
+def aggregate(readings, params):
+    """Reduce upstream readings according to the aggregation parameters; raises ValueError for bad input."""
+    validate(params)
+    buckets = params.get("buckets")
+    percentiles = params.get("percentiles")
+    downsample = params.get("downsample")
+    timestamps, columns = _to_columns(readings if isinstance(readings, list) else [])
+    result = {"count": int(len(timestamps))}
+    if not len(timestamps):
+        return result
+    result["start"] = format_timestamp(timestamps[0])
+    result["end"] = format_timestamp(timestamps[-1])
+
+    if buckets is not None:
+        bucketed = {}
+        starts = None
+        for name, column in columns.items():
+            bucketed[name], starts = bucketize(timestamps, column, buckets)
+        if starts is not None:
+            result["buckets"] = {
+                "timestamps": [format_timestamp(t) for t in starts],
+                "datapoints": bucketed,
+            }
+
+    if percentiles is not None:
+        result["percentiles"] = {
+            name: dict(zip((f"p{q:g}" for q in percentiles), np.percentile(column, percentiles).tolist()))
+            for name, column in columns.items()
+        }
+
+    if downsample is not None:
+        downsampled = {}
+        for name, column in columns.items():
+            keep = lttb(timestamps, column, downsample)
+            downsampled[name] = {
+                "timestamps": [format_timestamp(t) for t in timestamps[keep]],
+                "values": column[keep].tolist(),
+            }
+        result["downsampled"] = downsampled
+
+    return result
@@ -0,0 +1,139 @@
+"""
+Read-through cache for read-only tools.
+
+Results are cached per tool for a configurable TTL, keyed on the tool name and
+its normalised parameters. The cache is bounded and evicts the least recently
+used entry. Write tools invalidate the entries they affect, and a fetch that
+overlapped an invalidation of its tool does not store its result. Only
+results of fetches that succeed are stored.
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+
+# Default TTL in seconds per cacheable tool (0 disables caching for a tool)
+DEFAULT_TTLS = {
+    "list_sensors": 1.0,
+    "list_plugins": 30.0,
+    "get_service_status": 1.0,
+    "get_sensor_data": 1.0,
+}
+
+# Read tools whose entries are invalidated by each write tool
+INVALIDATES = {
+    "ingest_test_data": ("list_sensors", "get_sensor_data"),
+    "update_config": ("get_service_status", "list_plugins"),
+    "start_stop_service": ("get_service_status",),
+}
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+
+
+def parse_ttls(spec, defaults=DEFAULT_TTLS):
+    """Parse a "tool=seconds,tool=seconds" override string on top of the defaults."""
+    ttls = dict(defaults)
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        tool, _, seconds = item.partition("=")
+        ttls[tool.strip()] = float(seconds)
+    return ttls
+
+
+def normalise(params):
+    """Return a canonical string for tool parameters, ignoring order and null values."""
+    cleaned = {key: value for key, value in (params or {}).items() if value is not None}
+    return json.dumps(cleaned, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolCache:
+    """Size-bounded LRU cache with per-tool TTLs."""
+
+    def __init__(self, ttls=None, max_entries=DEFAULT_MAX_ENTRIES, clock=time.monotonic):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        # Bumped for a tool whenever its entries are invalidated
+        self._epochs = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def cacheable(self, tool):
+        """Return True if results of a tool are cached."""
+        return self.max_entries > 0 and self.ttls.get(tool, 0) > 0
+
+    def get(self, tool, params):
+        """Return (True, value) on a fresh hit, (False, None) otherwise."""
+        key = (tool, normalise(params))
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value, _ = entry
+            if expires > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, tool, params, value):
+        """Store a tool result, evicting the least recently used entries beyond the size bound."""
+        if not self.cacheable(tool):
+            return
+        key = (tool, normalise(params))
+        sensor_id = (params or {}).get("sensor_id")
+        self._entries[key] = (self.clock() + self.ttls[tool], value, sensor_id)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(self, tool, params, fetch):
+        """Return a cached result or await fetch() and cache what it returns."""
+        if not self.cacheable(tool):
+            return await fetch()
+        hit, value = self.get(tool, params)
+        if hit:
+            return value
+        epoch = self._epochs.get(tool, 0)
+        value = await fetch()
+        # A write during the fetch may have made the result stale
+        if self._epochs.get(tool, 0) == epoch:
+            self.set(tool, params, value)
+        return value
+
+    def invalidate(self, write_tool, params=None):
+        """Drop entries affected by a write tool; sensor-scoped writes only drop that sensor's entries."""
+        affected = INVALIDATES.get(write_tool, ())
+        params = params or {}
+        sensor_id = None if "readings" in params or "generator" in params else params.get("sensor_id")
+        for tool in affected:
+            self._epochs[tool] = self._epochs.get(tool, 0) + 1
+        for key in list(self._entries):
+            tool = key[0]
+            if tool not in affected:
+                continue
+            entry_sensor = self._entries[key][2]
+            if sensor_id is None or entry_sensor is None or entry_sensor == sensor_id:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self):
+        """Return hit, miss and size counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+        }
+
+
+# Shared cache for all transports in this process
+tool_cache = ToolCache(parse_ttls(os.getenv("CACHE_TTLS")))
@@ -0,0 +1,73 @@
+"""
+JSON codec used by the WebSocket and HTTP transports.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. ``dumps`` always returns UTF-8 encoded bytes so transports can
+write them without another encoding pass. Messages wrapped in ``Encoded``
+carry their serialized form and are written as-is.
+"""
+
+import json
+
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Parse errors raised by loads(); orjson's error subclasses json.JSONDecodeError
+JSONDecodeError = json.JSONDecodeError
+
+
+class Encoded(dict):
+    """A message that already has its JSON encoding attached."""
+
+    def __init__(self, message, encoded):
+        super().__init__(message)
+        self.encoded = encoded
+
+
+def dumps(obj):
+    """Serialize obj to JSON bytes, reusing pre-encoded messages."""
+    if isinstance(obj, Encoded):
+        return obj.encoded
+    if isinstance(obj, list) and any(isinstance(item, Encoded) for item in obj):
+        return b"[" + b",".join(dumps(item) for item in obj) + b"]"
+    return _dumps(obj)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _dumps(obj):
+        """Serialize obj to JSON bytes."""
+        try:
+            return orjson.dumps(obj, option=_OPTIONS)
+        except TypeError:
+            # Values orjson refuses (e.g. integers beyond 64 bits) still encode with the stdlib
+            return json.dumps(obj).encode("utf-8")
+
+    def loads(data):
+        """Parse JSON from bytes or str."""
+        return orjson.loads(data)
+else:
+    def _dumps(obj):
+        """Serialize obj to JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(data):
+        """Parse JSON from bytes or str."""
+        return json.loads(data)
+
+
+def dumps_text(obj):
+    """Serialize obj to a JSON string."""
+    return dumps(obj).decode("utf-8")
+
+
+def json_response(data, status=200, headers=None):
+    """Build an aiohttp JSON response encoded with the fast codec."""
+    return web.Response(body=dumps(data), status=status, headers=headers, content_type="application/json")
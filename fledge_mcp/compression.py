@@ -0,0 +1,163 @@
+"""
+Size-aware response compression for the WebSocket and HTTP transports.
+
+WebSocket: a permessage-deflate extension that leaves messages smaller than
+the threshold uncompressed. RFC 7692 lets a sender choose per message; the
+compressor's sliding window only ever sees compressed messages.
+
+HTTP: an aiohttp middleware that gzip- or deflate-encodes response bodies of
+at least the threshold when the client's ``Accept-Encoding`` allows it.
+Large bodies are compressed in a worker thread (zlib releases the GIL), so
+they do not stall the event loop. Streamed responses are sent as they are.
+
+Both record input and output bytes, compression time, ratio and skipped
+messages in the ``fledge_mcp_compression_*`` metrics.
+"""
+
+import os
+import time
+import zlib
+import asyncio
+
+from aiohttp import web
+from websockets import frames
+from websockets.extensions.permessage_deflate import PerMessageDeflate, ServerPerMessageDeflateFactory
+
+from fledge_mcp import metrics
+
+DEFAULT_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+DEFAULT_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+DEFAULT_WS_COMPRESSION = os.getenv("WS_COMPRESSION", "deflate").lower()
+DEFAULT_WS_WINDOW_BITS = int(os.getenv("WS_COMPRESSION_WINDOW_BITS", "12"))
+DEFAULT_HTTP_COMPRESSION = os.getenv("HTTP_COMPRESSION", "1").lower() not in ("0", "false", "no")
+# HTTP bodies at least this large are compressed off the event loop
+EXECUTOR_SIZE = 256 * 1024
+
+# zlib wbits producing each HTTP content coding
+_WBITS = {"gzip": 31, "deflate": 15}
+
+
+def record(transport, size, compressed_size, seconds):
+    """Account one compressed message in the metrics."""
+    metrics.compression_input_bytes.inc(size, transport=transport)
+    metrics.compression_output_bytes.inc(compressed_size, transport=transport)
+    metrics.compression_seconds.inc(seconds, transport=transport)
+    metrics.compression_ratio.observe(compressed_size / size, transport=transport)
+
+
+class ThresholdPerMessageDeflate(PerMessageDeflate):
+    """permessage-deflate that sends messages below min_size uncompressed."""
+
+    def __init__(self, *args, min_size=DEFAULT_MIN_SIZE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+        self._skip = False
+
+    def encode(self, frame):
+        if frame.opcode in frames.CTRL_OPCODES:
+            return frame
+        if frame.opcode is not frames.OP_CONT:
+            # Continuation frames follow the decision made for the message's first frame
+            self._skip = len(frame.data) < self.min_size
+            if self._skip:
+                metrics.compression_skipped.inc(transport="websocket")
+        if self._skip:
+            return frame
+        started = time.perf_counter()
+        encoded = super().encode(frame)
+        if frame.data:
+            record("websocket", len(frame.data), len(encoded.data), time.perf_counter() - started)
+        return encoded
+
+
+class ThresholdDeflateFactory(ServerPerMessageDeflateFactory):
+    """Negotiates permessage-deflate like websockets does, with a size threshold."""
+
+    def __init__(self, min_size=DEFAULT_MIN_SIZE, **kwargs):
+        super().__init__(**kwargs)
+        self.min_size = min_size
+
+    def process_request_params(self, params, accepted_extensions):
+        response_params, extension = super().process_request_params(params, accepted_extensions)
+        return response_params, ThresholdPerMessageDeflate(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            self.compress_settings,
+            min_size=self.min_size,
+        )
+
+
+def websocket_options(mode=DEFAULT_WS_COMPRESSION, min_size=DEFAULT_MIN_SIZE, level=DEFAULT_LEVEL,
+                      window_bits=DEFAULT_WS_WINDOW_BITS):
+    """Keyword arguments for websockets.serve enabling thresholded compression, or disabling it."""
+    if mode in ("none", "off", "0", "false", "no"):
+        return {"compression": None}
+    return {
+        "compression": None,
+        "extensions": [ThresholdDeflateFactory(
+            min_size=min_size,
+            server_max_window_bits=window_bits,
+            client_max_window_bits=window_bits,
+            compress_settings={"level": level, "memLevel": 5},
+        )],
+    }
+
+
+def choose_encoding(accept_encoding):
+    """Pick gzip or deflate from an Accept-Encoding header, or None."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().lower().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding.strip()] = weight
+    for coding in ("gzip", "deflate"):
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def _compress(body, coding, level):
+    started = time.perf_counter()
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[coding])
+    data = compressor.compress(body) + compressor.flush()
+    return data, time.perf_counter() - started
+
+
+def http_middleware(min_size=DEFAULT_MIN_SIZE, level=DEFAULT_LEVEL):
+    """aiohttp middleware compressing complete response bodies of at least min_size bytes."""
+
+    @web.middleware
+    async def compression_middleware(request, handler):
+        response = await handler(request)
+        if type(response) is not web.Response or response.body is None or "Content-Encoding" in response.headers:
+            return response
+        body = response.body
+        if not isinstance(body, (bytes, bytearray)):
+            return response
+        response.headers.add("Vary", "Accept-Encoding")
+        coding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if coding is None:
+            return response
+        if len(body) < min_size:
+            metrics.compression_skipped.inc(transport="http")
+            return response
+        if len(body) >= EXECUTOR_SIZE:
+            data, seconds = await asyncio.get_running_loop().run_in_executor(None, _compress, body, coding, level)
+        else:
+            data, seconds = _compress(body, coding, level)
+        record("http", len(body), len(data), seconds)
+        response.body = data
+        response.headers["Content-Encoding"] = coding
+        return response
+
+    return compression_middleware
@@ -0,0 +1,233 @@
+"""
+Asynchronous Fledge REST API client.
+
+All server entry points share this client so that upstream calls never block
+the event loop. Connections are kept alive in a bounded pool and every call
+carries total, connect and read timeouts. Concurrent identical GET requests
+are coalesced into a single in-flight upstream request whose result every
+caller receives.
+
+Idempotent GETs that fail with a connection error, timeout or 5xx response
+are retried with jittered exponential backoff. A circuit breaker counts
+those failures and, once Fledge looks down, fails calls immediately with
+``UpstreamUnavailable`` until a trial call succeeds again.
+"""
+
+import os
+import time
+import asyncio
+import logging
+
+import aiohttp
+
+from fledge_mcp import metrics, tracing
+from fledge_mcp.resilience import CLOSED, CircuitBreaker, backoff_delay
+
+logger = logging.getLogger("FledgeClient")
+
+# Default values (overridable through environment)
+DEFAULT_FLEDGE_API = "http://localhost:8081/fledge"
+DEFAULT_POOL_SIZE = int(os.getenv("FLEDGE_POOL_SIZE", "20"))
+DEFAULT_TIMEOUT = float(os.getenv("FLEDGE_TIMEOUT", "30"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("FLEDGE_CONNECT_TIMEOUT", "5"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("FLEDGE_READ_TIMEOUT", "15"))
+DEFAULT_RETRIES = int(os.getenv("FLEDGE_RETRIES", "2"))
+DEFAULT_RETRY_BACKOFF = float(os.getenv("FLEDGE_RETRY_BACKOFF", "0.2"))
+DEFAULT_RETRY_MAX_BACKOFF = float(os.getenv("FLEDGE_RETRY_MAX_BACKOFF", "2"))
+DEFAULT_KEEPALIVE = float(os.getenv("FLEDGE_KEEPALIVE", "30"))
+DEFAULT_COALESCE = os.getenv("FLEDGE_COALESCE", "1").lower() not in ("0", "false", "no")
+
+
+class FledgeAPIError(Exception):
+    """Raised when Fledge answers a request with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(f"Fledge API returned {status}: {message}")
+        self.status = status
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without contacting Fledge while the circuit breaker is open."""
+
+
+class FledgeClient:
+    """Pooled, keep-alive HTTP client for a single Fledge API base URL."""
+
+    def __init__(self, base_url=DEFAULT_FLEDGE_API, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, keepalive=DEFAULT_KEEPALIVE, coalesce=DEFAULT_COALESCE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 retries=DEFAULT_RETRIES, retry_backoff=DEFAULT_RETRY_BACKOFF,
+                 retry_max_backoff=DEFAULT_RETRY_MAX_BACKOFF, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive = keepalive
+        self.coalesce = coalesce
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.retry_max_backoff = retry_max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.coalesced = 0
+        self._inflight = {}
+        self._session = None
+        self._loop = None
+
+    def _get_session(self):
+        """Return the pooled session, creating it on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout(self.timeout)
+            )
+            self._loop = loop
+            self._inflight = {}
+        return self._session
+
+    def _timeout(self, total):
+        return aiohttp.ClientTimeout(total=total, sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+
+    def url(self, path):
+        """Build an absolute URL for an API path."""
+        return f"{self.base_url}{path}"
+
+    async def request(self, method, path, params=None, json=None, timeout=None, raise_for_status=False,
+                      retries=None):
+        """Perform a request against the Fledge API and return the decoded JSON body."""
+        # Only plain GETs are shared; a body or per-call timeout/retries would differ between callers
+        shareable = method.upper() == "GET" and json is None and timeout is None and retries is None
+        if not self.coalesce or not shareable:
+            return await self._call(method, path, params, json, timeout, raise_for_status, retries)
+
+        # Binds the in-flight table to the running loop
+        self._get_session()
+        key = (path, tuple(sorted((params or {}).items())), raise_for_status)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call(method, path, params, json, timeout, raise_for_status, retries))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        # Shield the shared request so one caller's cancellation does not fail the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        """Remove a finished shared request."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _call(self, method, path, params, json, timeout, raise_for_status, retries):
+        """Send a request through the circuit breaker, retrying idempotent GETs."""
+        if retries is None:
+            retries = self.retries
+        attempts = 1 + retries if method.upper() == "GET" else 1
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                metrics.upstream_rejected.inc()
+                raise UpstreamUnavailable(
+                    f"Fledge API unavailable (circuit open, retry in {self.breaker.retry_after():.1f}s)"
+                )
+            error = None
+            try:
+                status, data = await self._send(method, path, params, json, timeout, raise_for_status)
+            except FledgeAPIError as e:
+                if e.status < 500:
+                    # Fledge answered, so it is up even if it rejected this request
+                    self.breaker.record_success()
+                    raise
+                error = e
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                if status < 500:
+                    self.breaker.record_success()
+                    return data
+            self.breaker.record_failure()
+            if attempt + 1 == attempts or self.breaker.state != CLOSED:
+                if error is None:
+                    return data
+                raise error
+            delay = backoff_delay(attempt, self.retry_backoff, self.retry_max_backoff)
+            logger.warning(f"{method} {path} failed ({error or status}); retrying in {delay:.2f}s")
+            metrics.upstream_retries.inc(method=method)
+            await asyncio.sleep(delay)
+
+    async def _send(self, method, path, params, json, timeout, raise_for_status):
+        """Send one request upstream and return (status, decoded body)."""
+        session = self._get_session()
+        request_timeout = self._timeout(timeout) if timeout is not None else None
+        route = metrics.path_label(path)
+        status = "error"
+        started = time.perf_counter()
+        try:
+            async with session.request(method, self.url(path), params=params, json=json,
+                                       timeout=request_timeout) as response:
+                status = response.status
+                if raise_for_status and response.status >= 400:
+                    raise FledgeAPIError(response.status, (await response.text())[:200])
+                try:
+                    return response.status, await response.json(content_type=None)
+                except ValueError:
+                    if response.status < 400:
+                        raise
+                    # Error pages that are not JSON (e.g. an HTML 502 from a proxy) are upstream errors
+                    raise FledgeAPIError(response.status, (await response.text())[:200])
+        finally:
+            elapsed = time.perf_counter() - started
+            tracing.record("upstream", elapsed)
+            metrics.upstream_duration.observe(elapsed, method=method, path=route)
+            metrics.upstream_responses.inc(method=method, path=route, status=status)
+
+    async def get(self, path, params=None, timeout=None, raise_for_status=False, retries=None):
+        """GET an API path."""
+        return await self.request("GET", path, params=params, timeout=timeout, raise_for_status=raise_for_status,
+                                  retries=retries)
+
+    async def post(self, path, json=None, timeout=None, raise_for_status=False):
+        """POST a JSON payload to an API path."""
+        return await self.request("POST", path, json=json, timeout=timeout, raise_for_status=raise_for_status)
+
+    async def put(self, path, json=None, timeout=None, raise_for_status=False):
+        """PUT a JSON payload to an API path."""
+        return await self.request("PUT", path, json=json, timeout=timeout, raise_for_status=raise_for_status)
+
+    async def close(self):
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+# Shared clients, one per base URL
+_clients = {}
+
+
+def get_client(base_url=None):
+    """Return the shared client for a base URL (defaults to FLEDGE_API_URL)."""
+    if base_url is None:
+        base_url = os.getenv("FLEDGE_API_URL", DEFAULT_FLEDGE_API)
+    client = _clients.get(base_url)
+    if client is None:
+        client = FledgeClient(base_url)
+        _clients[base_url] = client
+    return client
+
+
+async def close_clients():
+    """Close every shared client."""
+    for client in list(_clients.values()):
+        await client.close()
+    _clients.clear()
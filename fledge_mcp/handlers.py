@@ -0,0 +1,389 @@
+"""
+Tool implementations shared by every transport.
+
+Handlers are registered by name with ``@tool`` and dispatched with a single
+dict lookup. Before a handler runs, its parameters are checked by the
+validator the registry compiled from the tool's schema and the call must be
+admitted by the shared admission controller. Handlers return the
+tool result and raise ``ToolError`` on failure; each transport formats both
+for its own protocol.
+"""
+
+import time
+import asyncio
+import logging
+
+import aiohttp
+from aiohttp import web
+
+from fledge_mcp import aggregation, ingest, logs, metrics, mockdata, streaming, tracing
+from fledge_mcp.admission import ServerBusy, admission_controller
+from fledge_mcp.cache import tool_cache
+from fledge_mcp.codec import json_response
+from fledge_mcp.fledge_client import FledgeAPIError, UpstreamUnavailable
+from fledge_mcp.registry import get_registry
+from fledge_mcp.subscriptions import subscription_manager
+from fledge_mcp.timeseries import sensor_store
+from fledge_mcp.validation import ValidationError
+
+logger = logging.getLogger("FledgeToolHandlers")
+
+# JSON-RPC error codes used by tool calls
+INVALID_PARAMS = -32602
+METHOD_NOT_FOUND = -32601
+SERVER_ERROR = -32000
+UPSTREAM_UNAVAILABLE = -32001
+SERVER_BUSY = -32002
+
+# HTTP status for each error code; anything else is a 500
+HTTP_STATUS = {INVALID_PARAMS: 400, METHOD_NOT_FOUND: 404, UPSTREAM_UNAVAILABLE: 503, SERVER_BUSY: 429}
+
+HANDLERS = {}
+
+
+class ToolError(Exception):
+    """A tool call failure with a JSON-RPC error code."""
+
+    def __init__(self, message, code=SERVER_ERROR, data=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+    @property
+    def status(self):
+        """HTTP status for this error."""
+        if isinstance(self.data, dict) and "upstream_status" in self.data:
+            # Fledge rejections keep their 4xx status; upstream server errors are a bad gateway
+            upstream = self.data["upstream_status"]
+            return upstream if 400 <= upstream < 500 else 502
+        return HTTP_STATUS.get(self.code, 500)
+
+    def to_dict(self):
+        """JSON-RPC error object."""
+        error = {"code": self.code, "message": str(self)}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+class ToolContext:
+    """Per-call state: the Fledge client and the connection the call arrived on."""
+
+    def __init__(self, client, session=None, request=None, meta=None):
+        self.client = client
+        self.session = session
+        self.request = request
+        self.meta = meta or {}
+
+    @property
+    def client_key(self):
+        """Identity used for per-client rate limits: the session's id, else the HTTP peer address."""
+        if self.session is not None:
+            # Not the session itself, so buckets never keep a closed connection alive
+            return id(self.session)
+        if self.request is not None:
+            return self.request.remote
+        return None
+
+
+def tool(name):
+    """Register the decorated coroutine as the handler for a tool."""
+    def register(func):
+        HANDLERS[name] = func
+        return func
+    return register
+
+
+async def call_tool(name, params, context, registry=None):
+    """Validate params against the tool's schema and run its handler."""
+    if params is None:
+        params = {}
+    if logger.isEnabledFor(logging.INFO) and logs.sampled():
+        logger.info("Received tool call: %s with params: %s", name, logs.Truncated(params), extra={"tool": name})
+    handler = HANDLERS.get(name)
+    if handler is None:
+        raise ToolError("Unknown tool", METHOD_NOT_FOUND)
+    validator = (registry or get_registry()).validators.get(name)
+    try:
+        with tracing.span("validate"):
+            if validator is not None:
+                validator(params)
+            elif not isinstance(params, dict):
+                raise ValidationError("parameters must be an object")
+    except ValidationError as e:
+        raise ToolError(str(e), INVALID_PARAMS)
+    try:
+        with tracing.span("admission"):
+            await admission_controller.acquire(context.client_key, name)
+    except ServerBusy as e:
+        metrics.tool_calls.inc(tool=name, status="rejected")
+        raise ToolError(str(e), SERVER_BUSY, {"reason": e.reason, "retry_after": e.retry_after})
+    status = "error"
+    started = time.perf_counter()
+    metrics.requests_in_flight.inc()
+    try:
+        with tracing.span("handler"):
+            result = await handler(params, context)
+        status = "ok"
+        return result
+    except ToolError:
+        raise
+    except UpstreamUnavailable as e:
+        raise ToolError(str(e), UPSTREAM_UNAVAILABLE)
+    except FledgeAPIError as e:
+        logger.error(f"Error in {name}: {str(e)}")
+        raise ToolError(str(e), SERVER_ERROR, {"upstream_status": e.status})
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+        logger.error(f"Fledge API unreachable in {name}: {str(e) or type(e).__name__}")
+        raise ToolError(f"Fledge API unreachable: {str(e) or type(e).__name__}", UPSTREAM_UNAVAILABLE)
+    except Exception as e:
+        logger.error(f"Error in {name}: {str(e)}")
+        raise ToolError(str(e))
+    finally:
+        admission_controller.release(name)
+        metrics.requests_in_flight.dec()
+        metrics.tool_calls.inc(tool=name, status=status)
+        metrics.tool_duration.observe(time.perf_counter() - started, tool=name)
+
+
+async def http_response(data, context, registry=None):
+    """Run a tool call posted over HTTP and build the aiohttp response."""
+    try:
+        result = await call_tool(data.get("name"), data.get("parameters", {}), context, registry)
+    except ToolError as e:
+        return json_response({"error": str(e)}, status=e.status)
+    if isinstance(result, web.StreamResponse):
+        return result
+    if not isinstance(result, (dict, list)):
+        # Status messages are wrapped so HTTP bodies stay JSON objects
+        result = {"result": result}
+    return json_response(result)
+
+
+# Data Access and Management Tools
+
+@tool("get_sensor_data")
+async def get_sensor_data(params, context):
+    sensor_id = params["sensor_id"]
+    time_range = params.get("time_range")
+    limit = params.get("limit", 100)
+    client = context.client
+    try:
+        aggregation.validate(params)
+        if streaming.requested(params):
+            page_size = streaming.page_size_from_params(params)
+            if aggregation.requested(params):
+                raise ValueError("stream cannot be combined with aggregation")
+    except ValueError as e:
+        raise ToolError(str(e), INVALID_PARAMS)
+    if streaming.requested(params):
+        pages = streaming.iter_pages(client, sensor_id, limit, page_size, time_range)
+        if context.session is not None:
+            return await streaming.stream_to_session(context.session, pages, context.meta.get("progressToken"), limit)
+        if context.request is not None:
+            return await streaming.stream_to_response(context.request, pages)
+        raise ToolError("stream is not supported on this connection", INVALID_PARAMS)
+    readings = None if time_range else sensor_store.latest(sensor_id, limit)
+    if readings is None:
+        query = {"limit": limit}
+        if time_range:
+            query["time_range"] = time_range
+        readings = await tool_cache.get_or_fetch(
+            "get_sensor_data", {"sensor_id": sensor_id, **query},
+            lambda: client.get(f"/asset/{sensor_id}", params=query, raise_for_status=True)
+        )
+        if not time_range:
+            sensor_store.sync(sensor_id, readings)
+    if aggregation.requested(params):
+        try:
+            return aggregation.aggregate(readings, params)
+        except ValueError as e:
+            raise ToolError(str(e), INVALID_PARAMS)
+    return readings
+
+
+@tool("list_sensors")
+async def list_sensors(params, context):
+    return await tool_cache.get_or_fetch("list_sensors", params, lambda: context.client.get("/asset", raise_for_status=True))
+
+
+@tool("ingest_test_data")
+async def ingest_test_data(params, context):
+    try:
+        readings = ingest.readings_from_params(params)
+    except ValueError as e:
+        raise ToolError(str(e), INVALID_PARAMS)
+    report = await ingest.ingest(
+        context.client, readings,
+        batch_size=params.get("batch_size", ingest.DEFAULT_BATCH_SIZE),
+        concurrency=params.get("concurrency", ingest.DEFAULT_CONCURRENCY)
+    )
+    tool_cache.invalidate("ingest_test_data", params)
+    if ingest.is_bulk(params):
+        return report
+    return f"Ingested {report['ingested']} data points"
+
+
+# Service Control Tools
+
+@tool("get_service_status")
+async def get_service_status(params, context):
+    return await tool_cache.get_or_fetch("get_service_status", params, lambda: context.client.get("/service", raise_for_status=True))
+
+
+@tool("start_stop_service")
+async def start_stop_service(params, context):
+    service_type = params["service_type"]
+    action = params["action"]
+    # Output is captured: stdout may be the JSON-RPC stream of the stdio transport
+    process = await asyncio.create_subprocess_exec(
+        "fledge", action, service_type, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    output, _ = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"fledge {action} {service_type} exited with status {process.returncode}: "
+                           f"{output.decode(errors='replace').strip()[-200:]}")
+    tool_cache.invalidate("start_stop_service", params)
+    return f"{service_type} {action}ed"
+
+
+@tool("update_config")
+async def update_config(params, context):
+    result = await context.client.put("/category/core", json={params["config_key"]: params["value"]})
+    tool_cache.invalidate("update_config", params)
+    return result
+
+
+# Frontend Code Generation Tools
+
+@tool("generate_ui_component")
+async def generate_ui_component(params, context):
+    component_type = params["component_type"]
+    sensor_id = params.get("sensor_id", "example_sensor")
+    if component_type != "chart":
+        raise ToolError("Unsupported component_type", INVALID_PARAMS)
+    code = f"""
+import React, {{ useEffect, useState }} from 'react';
+import {{ Line }} from 'react-chartjs-2';
+import axios from 'axios';
+
+const {sensor_id}Chart = () => {{
+  const [data, setData] = useState({{ labels: [], datasets: [] }});
+
+  useEffect(() => {{
+    axios.get('{context.client.base_url}/asset/{sensor_id}')
+      .then(res => {{
+        const readings = res.data;
+        setData({{
+          labels: readings.map(r => r.timestamp),
+          datasets: [{{ label: '{sensor_id}', data: readings.map(r => r.readings.value) }}]
+        }});
+      }});
+  }}, []);
+
+  return <Line data={{data}} />;
+}};
+export default {sensor_id}Chart;
+"""
+    return {"code": code}
+
+
+@tool("fetch_sample_frontend")
+async def fetch_sample_frontend(params, context):
+    framework = params.get("framework", "react")
+    # Simplified: return a basic template
+    code = f"// Sample {framework} frontend for Fledge\nconsole.log('Hello Fledge');"
+    return {"code": code}
+
+
+# Real-Time Data Streaming Tools
+
+@tool("subscribe_to_sensor")
+async def subscribe_to_sensor(params, context):
+    sensor_id = params["sensor_id"]
+    interval = params.get("interval", 5)
+    if context.session is None:
+        raise ToolError("subscribe_to_sensor requires a WebSocket connection", INVALID_PARAMS)
+    subscription_manager.subscribe(sensor_id, context.session, interval)
+    return f"Subscribed to {sensor_id} every {interval}s"
+
+
+@tool("unsubscribe_from_sensor")
+async def unsubscribe_from_sensor(params, context):
+    sensor_id = params["sensor_id"]
+    if context.session is None or not subscription_manager.unsubscribe(sensor_id, context.session):
+        raise ToolError(f"Not subscribed to {sensor_id}", INVALID_PARAMS)
+    return f"Unsubscribed from {sensor_id}"
+
+
+@tool("get_latest_reading")
+async def get_latest_reading(params, context):
+    sensor_id = params["sensor_id"]
+    readings = sensor_store.latest(sensor_id, 1)
+    if readings is None:
+        readings = await context.client.get(f"/asset/{sensor_id}", params={"limit": 1})
+        sensor_store.sync(sensor_id, readings)
+    if not readings:
+        raise ToolError(f"No readings for {sensor_id}")
+    return readings[0]
+
+
+# Debugging and Validation Tools
+
+@tool("validate_api_connection")
+async def validate_api_connection(params, context):
+    breaker = context.client.breaker
+    try:
+        ping = await context.client.get("/ping", raise_for_status=True)
+    except Exception as e:
+        raise ToolError(f"API unreachable: {str(e) or type(e).__name__} (circuit {breaker.state})",
+                        UPSTREAM_UNAVAILABLE)
+    return {"status": "reachable", "version": ping["version"], "circuit": breaker.status()}
+
+
+@tool("simulate_frontend_request")
+async def simulate_frontend_request(params, context):
+    method = params.get("method", "GET")
+    payload = params.get("payload", {})
+    return await context.client.request(method, params["endpoint"], json=payload)
+
+
+# Documentation and Schema Tools
+
+@tool("get_api_schema")
+async def get_api_schema(params, context):
+    # Simplified: return known endpoints
+    return {"endpoints": ["/asset", "/service", "/south/ingest"]}
+
+
+@tool("list_plugins")
+async def list_plugins(params, context):
+    return await tool_cache.get_or_fetch("list_plugins", params, lambda: context.client.get("/plugin", raise_for_status=True))
+
+
+# Advanced AI-Assisted Features
+
+@tool("suggest_ui_improvements")
+async def suggest_ui_improvements(params, context):
+    code = params["code"]
+    suggestions = ["Add error handling for API calls"] if "try" not in code else ["Looks good!"]
+    return {"suggestions": suggestions}
+
+
+@tool("generate_mock_data")
+async def generate_mock_data(params, context):
+    try:
+        generator = mockdata.from_params(params)
+        fmt = mockdata.format_from_params(params)
+    except ValueError as e:
+        raise ToolError(str(e), INVALID_PARAMS)
+    if not mockdata.should_stream(params, generator):
+        return mockdata.render(generator, fmt)
+    pages = mockdata.iter_pages(generator, fmt, params.get("chunk_size", mockdata.DEFAULT_CHUNK_SIZE))
+    if context.session is not None:
+        return await streaming.stream_to_session(
+            context.session, pages, context.meta.get("progressToken"), generator.points, mockdata.page_points
+        )
+    if context.request is not None:
+        return await streaming.stream_to_response(context.request, pages)
+    raise ToolError(f"more than {mockdata.INLINE_LIMIT} points must be streamed", INVALID_PARAMS)
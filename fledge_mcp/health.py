@@ -0,0 +1,150 @@
+"""
+Health, readiness and metrics HTTP endpoints.
+
+Served by aiohttp on the same event loop as the WebSocket server, so a slow
+scraper never blocks health checks. Readiness reflects a background probe
+of the upstream Fledge ``/ping`` whose last result is cached; answering
+``/ready`` never calls Fledge.
+
+- ``/health``: liveness, always 200 while the loop is responsive
+- ``/ready``: 200 if the last upstream ping succeeded recently, else 503
+- ``/metrics``: Prometheus metrics
+- ``/debug/profile?seconds=N``: samples the event loop thread for N seconds
+  and returns collapsed stacks; only served when ``ADMIN_TOKEN`` is set and
+  the request carries it in the ``X-Admin-Token`` header
+"""
+
+import os
+import hmac
+import math
+import time
+import asyncio
+import logging
+import threading
+
+from aiohttp import web
+
+from fledge_mcp import metrics
+from fledge_mcp.admission import admission_controller
+from fledge_mcp.cache import tool_cache
+from fledge_mcp.codec import json_response
+from fledge_mcp.profiler import SamplingProfiler
+from fledge_mcp.timeseries import sensor_store
+
+logger = logging.getLogger("FledgeHealth")
+
+DEFAULT_PING_INTERVAL = float(os.getenv("READY_PING_INTERVAL", "5"))
+DEFAULT_PING_TIMEOUT = float(os.getenv("READY_PING_TIMEOUT", "2"))
+DEFAULT_ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+class UpstreamProbe:
+    """Periodically pings the Fledge API and caches the outcome."""
+
+    def __init__(self, client, interval=DEFAULT_PING_INTERVAL, timeout=DEFAULT_PING_TIMEOUT, clock=time.monotonic):
+        self.client = client
+        self.interval = interval
+        self.timeout = timeout
+        self.clock = clock
+        self.ok = False
+        self.version = None
+        self.error = "not checked yet"
+        self.checked_at = None
+
+    @property
+    def max_age(self):
+        """Results older than this no longer count as ready."""
+        return 3 * self.interval + self.timeout
+
+    @property
+    def ready(self):
+        return self.ok and self.checked_at is not None and self.clock() - self.checked_at <= self.max_age
+
+    async def check(self):
+        """Ping Fledge once and record the result."""
+        try:
+            # Not retried: the next probe is the retry
+            ping = await self.client.get("/ping", timeout=self.timeout, raise_for_status=True, retries=0)
+            self.ok = True
+            self.version = ping.get("version") if isinstance(ping, dict) else None
+            self.error = None
+        except Exception as e:
+            if self.ok:
+                logger.warning(f"Fledge API became unreachable: {e}")
+            self.ok = False
+            self.error = str(e) or type(e).__name__
+        self.checked_at = self.clock()
+        return self.ok
+
+    async def run(self):
+        """Check forever at the configured interval."""
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def status(self):
+        """Cached probe result for health responses."""
+        age = round(self.clock() - self.checked_at, 3) if self.checked_at is not None else None
+        circuit = self.client.breaker.status() if self.client is not None else None
+        return {"ready": self.ready, "version": self.version, "error": self.error, "age_seconds": age,
+                "circuit": circuit}
+
+
+def create_app(probe, admin_token=DEFAULT_ADMIN_TOKEN):
+    """Build the aiohttp application serving /health, /ready, /metrics and, with an admin token, /debug."""
+    profiling = asyncio.Lock()
+
+    async def health(request):
+        return json_response({
+            "status": "ok",
+            "message": "Fledge MCP Server is running",
+            "upstream": probe.status(),
+            "cache": tool_cache.stats(),
+            "store": sensor_store.stats(),
+            "admission": admission_controller.stats()
+        })
+
+    async def ready(request):
+        status = probe.status()
+        return json_response({"status": "ready" if status["ready"] else "not ready", "upstream": status},
+                             status=200 if status["ready"] else 503)
+
+    async def metrics_endpoint(request):
+        return web.Response(body=metrics.registry.render().encode("utf-8"),
+                            headers={"Content-Type": metrics.CONTENT_TYPE})
+
+    async def profile(request):
+        if not hmac.compare_digest(request.headers.get(ADMIN_TOKEN_HEADER, ""), admin_token):
+            return json_response({"error": "Forbidden"}, status=403)
+        try:
+            seconds = float(request.query.get("seconds", "10"))
+        except ValueError:
+            seconds = math.nan
+        if not (math.isfinite(seconds) and seconds > 0):
+            return json_response({"error": "seconds must be a positive number"}, status=400)
+        if profiling.locked():
+            return json_response({"error": "A profile is already running"}, status=409)
+        async with profiling:
+            logger.info(f"Profiling the event loop for {seconds}s")
+            profiler = SamplingProfiler(threading.get_ident())
+            await asyncio.to_thread(profiler.run, seconds)
+        return web.Response(text=profiler.collapsed(), headers={"X-Profile-Samples": str(profiler.samples)})
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_get("/ready", ready)
+    app.router.add_get("/metrics", metrics_endpoint)
+    if admin_token:
+        app.router.add_get("/debug/profile", profile)
+    return app
+
+
+async def start_health_server(probe, port=8083, host="0.0.0.0"):
+    """Serve the health endpoints on the running loop and return the runner."""
+    runner = web.AppRunner(create_app(probe), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    logger.info(f"Serving health checks and metrics on port {port}")
+    return runner
@@ -0,0 +1,164 @@
+"""
+Bulk ingestion of readings into Fledge.
+
+Readings come either from an explicit list or from a generator spec and are
+produced lazily. They are sent to ``/south/ingest`` in batches by a bounded
+pool of workers; a bounded queue between producer and workers provides
+backpressure so memory stays flat whatever the number of readings.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from fledge_mcp.timeseries import sensor_store
+
+logger = logging.getLogger("FledgeIngest")
+
+INGEST_PATH = "/south/ingest"
+DEFAULT_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "8"))
+DEFAULT_BATCH_SIZE = 1
+MAX_REPORTED_FAILURES = 20
+
+
+def is_bulk(params):
+    """Return True if the tool parameters request bulk ingestion."""
+    return "readings" in params or "generator" in params
+
+
+def readings_from_params(params):
+    """Return a lazy iterable of ingest payloads described by the tool parameters."""
+    if "readings" in params:
+        return _explicit_readings(params["readings"], params.get("sensor_id"))
+    if "generator" in params:
+        return _generated_readings(params["generator"])
+
+    sensor_id = params.get("sensor_id")
+    value = params.get("value")
+    count = params.get("count", 1)
+    if not sensor_id or value is None:
+        raise ValueError("sensor_id and value required")
+    return ({"asset": sensor_id, "timestamp": "now", "readings": {"value": value}} for _ in range(count))
+
+
+def _explicit_readings(readings, default_asset=None):
+    """Validate a list of readings supplied by the caller."""
+    if not isinstance(readings, list):
+        raise ValueError("readings must be a list")
+    payloads = []
+    for index, reading in enumerate(readings):
+        if not isinstance(reading, dict):
+            raise ValueError(f"readings[{index}] must be an object")
+        asset = reading.get("asset", default_asset)
+        values = reading.get("readings")
+        if not asset or not isinstance(values, dict):
+            raise ValueError(f"readings[{index}] requires an asset and a readings object")
+        payloads.append({"asset": asset, "timestamp": reading.get("timestamp", "now"), "readings": values})
+    return payloads
+
+
+def _number(spec, name, default, kind=float):
+    """Read a numeric generator option, raising ValueError if it is not a number."""
+    value = spec.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"generator {name} must be a number")
+    return kind(value)
+
+
+def _generated_readings(spec):
+    """Validate a generator spec and return a lazy payload generator (timestamps in UTC)."""
+    if not isinstance(spec, dict):
+        raise ValueError("generator must be an object")
+    assets = spec.get("assets")
+    if assets is None:
+        prefix = spec.get("asset_prefix", "sensor")
+        assets = [f"{prefix}_{i}" for i in range(_number(spec, "asset_count", 1, int))]
+    if not isinstance(assets, list) or not assets:
+        raise ValueError("generator requires at least one asset")
+    count = _number(spec, "count", 1, int)
+    low = _number(spec, "min", 0.0)
+    high = _number(spec, "max", 100.0)
+    if count < 0 or low > high:
+        raise ValueError("generator requires count >= 0 and min <= max")
+    interval = timedelta(seconds=_number(spec, "interval", 1.0))
+    datapoint = spec.get("datapoint", "value")
+    if "start" in spec:
+        try:
+            start = datetime.fromisoformat(spec["start"])
+        except (TypeError, ValueError):
+            raise ValueError("generator start must be an ISO 8601 timestamp")
+        if start.tzinfo is not None:
+            start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    else:
+        # Naive timestamps are read back as UTC, so generate them in UTC
+        start = datetime.now(timezone.utc).replace(tzinfo=None) - interval * count
+    rng = random.Random(spec.get("seed"))
+
+    def generate():
+        for i in range(count):
+            timestamp = str(start + interval * i)
+            for asset in assets:
+                yield {"asset": asset, "timestamp": timestamp, "readings": {datapoint: rng.uniform(low, high)}}
+
+    return generate()
+
+
+def _batches(readings, batch_size):
+    """Group payloads into lists of at most batch_size."""
+    batch = []
+    for reading in readings:
+        batch.append(reading)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def ingest(client, readings, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """Send readings upstream in batches with bounded concurrency and return a report."""
+    batch_size = max(1, int(batch_size))
+    concurrency = max(1, int(concurrency))
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    report = {"ingested": 0, "failed": 0, "batches": 0, "failed_batches": 0, "failures": []}
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, batch = item
+            body = batch[0] if batch_size == 1 else batch
+            try:
+                await client.post(INGEST_PATH, json=body, raise_for_status=True)
+                report["ingested"] += len(batch)
+                for reading in batch:
+                    sensor_store.record(reading["asset"], reading["timestamp"], reading["readings"])
+            except Exception as e:
+                report["failed"] += len(batch)
+                report["failed_batches"] += 1
+                if len(report["failures"]) < MAX_REPORTED_FAILURES:
+                    report["failures"].append({"batch": index, "size": len(batch), "error": str(e)})
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        for index, batch in enumerate(_batches(readings, batch_size)):
+            await queue.put((index, batch))
+            report["batches"] += 1
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+    elapsed = time.perf_counter() - started
+    report["elapsed_seconds"] = round(elapsed, 6)
+    report["readings_per_second"] = round(report["ingested"] / elapsed, 1) if elapsed > 0 else None
+    if report["failed"]:
+        logger.warning(f"Ingest finished with {report['failed']} failed readings in {report['failed_batches']} batches")
+    return report
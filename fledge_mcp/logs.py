@@ -0,0 +1,122 @@
+"""
+Logging configuration for the servers.
+
+Records are handed to a ``QueueHandler`` on the calling thread and
+formatted and written by a ``QueueListener`` thread, so log I/O never
+blocks the event loop. Output is either the classic text format or one JSON
+object per line. Per-call logs are sampled and log their parameters through
+``Truncated``, which formats lazily and bounds the output size.
+"""
+
+import os
+import sys
+import copy
+import queue
+import atexit
+import random
+import logging
+import reprlib
+from logging.handlers import QueueHandler, QueueListener
+
+from fledge_mcp import codec
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DEFAULT_FORMAT = os.getenv("LOG_FORMAT", "text")
+# Fraction of per-call log lines that are written (1 logs every call)
+SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1"))
+# Maximum characters of a logged parameter object
+PARAM_LIMIT = int(os.getenv("LOG_PARAM_LIMIT", "256"))
+
+# Attributes every LogRecord has; anything else was passed as structured extra fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_repr = reprlib.Repr()
+_repr.maxstring = 64
+_repr.maxother = 64
+_repr.maxdict = 16
+_repr.maxlist = 16
+_repr.maxlevel = 3
+
+_listener = None
+
+
+class Truncated:
+    """Log argument rendering a bounded repr of value only when the record is emitted."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit=None):
+        self.value = value
+        self.limit = PARAM_LIMIT if limit is None else limit
+
+    def __str__(self):
+        text = _repr.repr(self.value)
+        if len(text) > self.limit:
+            return text[:self.limit] + "..."
+        return text
+
+
+def sampled(rate=None):
+    """Return True if this per-call log line should be written."""
+    rate = SAMPLE_RATE if rate is None else rate
+    return rate >= 1 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects including extra fields."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        worker = os.environ.get("WORKER_ID")
+        if worker is not None:
+            entry["worker"] = int(worker)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return codec.dumps_text(entry)
+
+
+class LoopQueueHandler(QueueHandler):
+    """Resolves the message on the calling thread; formatting and I/O happen on the listener thread."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure(level=logging.INFO, fmt=DEFAULT_FORMAT, stream=None):
+    """Route the root logger through a background listener thread writing text or JSON lines."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    records = queue.SimpleQueue()
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(LoopQueueHandler(records))
+    root.setLevel(level)
+    _listener.start()
+    return _listener
+
+
+def shutdown():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown)
@@ -8,17 +8,16 @@ handling command-line arguments, environment variables, and server configuration
 
 import os
 import sys
+import signal
+import socket
 import asyncio
 import logging
 import argparse
-import json
-from pathlib import Path
-import http.server
-import socketserver
-import threading
 
 import websockets
 
+from fledge_mcp import registry
+
 # Configure root logger
 logging.basicConfig(
     level=logging.INFO,
@@ -29,7 +28,7 @@ logger = logging.getLogger("FledgeMCP")
 # Default values
 DEFAULT_PORT = 8082
 DEFAULT_FLEDGE_API = "http://localhost:8081/fledge"
-DEFAULT_TOOLS_FILE = str(Path(__file__).parent / "smithery.json")
+DEFAULT_TOOLS_FILE = registry.DEFAULT_TOOLS_FILE
 
 # Server info
 SERVER_INFO = {
@@ -46,15 +45,8 @@ SERVER_INFO = {
 
 # Load tools from JSON file
 def load_tools(tools_file=DEFAULT_TOOLS_FILE):
-    """Load tool definitions from a JSON file."""
-    try:
-        with open(tools_file, 'r') as f:
-            config = json.load(f)
-        return config.get("tools", [])
-    except Exception as e:
-        logger.error(f"Failed to load tools from {tools_file}: {e}")
-        # Provide minimal set of tools if file can't be loaded
-        return []
+    """Return tool definitions from the cached registry for a JSON file."""
+    return list(registry.get_registry(tools_file).tools)
 
 # Configuration schema
 CONFIG_SCHEMA = {
@@ -68,9 +60,6 @@ CONFIG_SCHEMA = {
     }
 }
 
-# Mock data store (in-memory for ephemeral storage)
-subscriptions = {}
-
 async def handle_initialize(params, api_key=None):
     """Handle the initialize method required by MCP."""
     return {
@@ -83,21 +72,39 @@ async def handle_initialize(params, api_key=None):
     }
 
 async def handle_tools_list(params, tools_file=DEFAULT_TOOLS_FILE, api_key=None):
-    """Handle the tools/list method."""
-    tools = load_tools(tools_file)
-    return {
-        "jsonrpc": "2.0",
-        "result": {
-            "tools": tools
-        },
-        "id": params.get("id")
-    }
+    """Handle the tools/list method with the registry's pre-serialized catalog."""
+    return registry.get_registry(tools_file).tools_list_response(params.get("id"))
 
 # Import the tool handling logic
 from fledge_mcp.smithery_server import handle_tool_call
+from fledge_mcp.fledge_client import close_clients, get_client
+from fledge_mcp.health import UpstreamProbe, start_health_server
+from fledge_mcp.supervisor import Supervisor
+from fledge_mcp.session import Session, DEFAULT_MAX_CONCURRENCY
+from fledge_mcp.subscriptions import subscription_manager
+from fledge_mcp import compression, logs, metrics, stdio, tracing
 
-async def handle_message(message_data, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None):
-    """Handle incoming JSON-RPC messages."""
+async def handle_message(message_data, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None,
+                         session=None):
+    """Handle incoming JSON-RPC messages, including batches."""
+    if isinstance(message_data, list):
+        return await handle_batch(message_data, fledge_api, tools_file, api_key, session)
+    return await handle_request(message_data, fledge_api, tools_file, api_key, session)
+
+async def handle_batch(batch, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None, session=None):
+    """Handle a JSON-RPC batch, running its calls concurrently."""
+    if not batch:
+        return {"jsonrpc": "2.0", "error": {"code": -32600, "message": "Invalid Request"}, "id": None}
+    calls = [handle_request(message, fledge_api, tools_file, api_key, session) for message in batch]
+    # On a connection every call waits for its own slot, so large batches queue instead of fanning out at once
+    if session is not None:
+        calls = [session.limited(call) for call in calls]
+    responses = await asyncio.gather(*calls)
+    return [response for response in responses if response is not None] or None
+
+async def handle_request(message_data, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None,
+                         session=None):
+    """Handle a single JSON-RPC request."""
     try:
         if not isinstance(message_data, dict):
             return {"jsonrpc": "2.0", "error": {"code": -32600, "message": "Invalid Request"}, "id": None}
@@ -106,6 +113,10 @@ async def handle_message(message_data, fledge_api=DEFAULT_FLEDGE_API, tools_file
         params = message_data.get("params", {})
         msg_id = message_data.get("id")
 
+        # Client notifications (e.g. notifications/initialized) get no response
+        if isinstance(method, str) and method.startswith("notifications/") and "id" not in message_data:
+            return None
+
         # Set environment variable for imported handlers
         os.environ["FLEDGE_API_URL"] = fledge_api
 
@@ -114,12 +125,16 @@ async def handle_message(message_data, fledge_api=DEFAULT_FLEDGE_API, tools_file
         elif method == "tools/list":
             return await handle_tools_list(message_data, tools_file, api_key)
         elif method == "tools/call":
-            result = await handle_tool_call(params)
-            return {
+            trace = tracing.start()
+            result = await handle_tool_call(params, session, tools_file)
+            response = {
                 "jsonrpc": "2.0",
                 **result,
                 "id": msg_id
             }
+            if tracing.requested(params):
+                response["timing"] = trace.timing()
+            return response
         else:
             return {
                 "jsonrpc": "2.0",
@@ -135,66 +150,30 @@ async def handle_message(message_data, fledge_api=DEFAULT_FLEDGE_API, tools_file
             "id": message_data.get("id", None)
         }
 
-async def handle_websocket(websocket, path, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None):
-    """Handle WebSocket connections."""
+async def handle_websocket(websocket, path, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None,
+                           max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Handle WebSocket connections, processing requests on a connection concurrently."""
+    session = Session(
+        websocket.send,
+        lambda data, session: handle_message(data, fledge_api, tools_file, api_key, session),
+        max_concurrency
+    )
+    metrics.websocket_connections.inc()
     try:
-        logger.info(f"Client connected: {websocket.remote_address}")
+        logger.info("Client connected: %s", websocket.remote_address)
         async for message in websocket:
-            try:
-                logger.debug(f"Received message: {message}")
-                data = json.loads(message)
-                response = await handle_message(data, fledge_api, tools_file, api_key)
-                logger.debug(f"Sending response: {response}")
-                await websocket.send(json.dumps(response))
-            except json.JSONDecodeError:
-                await websocket.send(json.dumps({
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32700, "message": "Parse error"},
-                    "id": None
-                }))
-            except Exception as e:
-                logger.error(f"Error processing message: {str(e)}")
-                await websocket.send(json.dumps({
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32000, "message": str(e)},
-                    "id": None
-                }))
+            logger.debug("Received message: %s", logs.Truncated(message))
+            await session.dispatch(message)
     except websockets.exceptions.ConnectionClosed:
         logger.info("Client disconnected")
+    finally:
+        metrics.websocket_connections.dec()
+        subscription_manager.unsubscribe_all(session)
+        await session.close()
 
-class HealthCheckHandler(http.server.BaseHTTPRequestHandler):
-    """HTTP handler for health check endpoint."""
-    
-    def do_GET(self):
-        """Handle GET requests."""
-        if self.path == "/health":
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            response = json.dumps({"status": "ok", "message": "Fledge MCP Server is running"})
-            self.wfile.write(response.encode('utf-8'))
-        else:
-            self.send_response(404)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            response = json.dumps({"error": "Not found", "status": 404})
-            self.wfile.write(response.encode('utf-8'))
-    
-    def log_message(self, format, *args):
-        """Override to use our logger."""
-        logger.info("%s - - [%s] %s" % (self.address_string(), self.log_date_time_string(), format%args))
-
-def start_http_server(port=8083):
-    """Start HTTP server for health checks."""
-    handler = HealthCheckHandler
-    httpd = socketserver.TCPServer(("", port), handler)
-    logger.info(f"Starting HTTP server for health checks on port {port}")
-    http_thread = threading.Thread(target=httpd.serve_forever, daemon=True)
-    http_thread.start()
-    return httpd
-
-async def main(port=DEFAULT_PORT, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None, http_port=8083):
-    """Start the WebSocket server."""
+async def main(port=DEFAULT_PORT, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None, http_port=8083,
+               max_concurrency=DEFAULT_MAX_CONCURRENCY, reuse_port=False):
+    """Start the WebSocket server; reuse_port lets several worker processes share the WebSocket port."""
     logger.info(f"Starting Fledge MCP Server on port {port}...")
     logger.info(f"Using Fledge API: {fledge_api}")
     logger.info(f"Loading tools from: {tools_file}")
@@ -202,24 +181,68 @@ async def main(port=DEFAULT_PORT, fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFA
     if api_key:
         logger.info("API key authentication enabled")
     
-    # Start HTTP server for health checks
-    http_server = start_http_server(http_port)
+    # Reload tool definitions on SIGHUP
+    if hasattr(signal, "SIGHUP"):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, registry.reload_all)
+    registry.get_registry(tools_file)
+
+    # Serve health checks, readiness and metrics on this loop
+    probe = UpstreamProbe(get_client(fledge_api))
+    probe_task = asyncio.create_task(probe.run())
+    # Each worker binds its own health port so its /metrics can be scraped on its own
+    health_runner = await start_health_server(probe, http_port)
     
     # Initialize the server
     server = await websockets.serve(
-        lambda ws, path: handle_websocket(ws, path, fledge_api, tools_file, api_key),
+        lambda ws, path: handle_websocket(ws, path, fledge_api, tools_file, api_key, max_concurrency),
         "0.0.0.0", 
-        port
+        port,
+        reuse_port=reuse_port or None,
+        **compression.websocket_options()
     )
+
+    # Close connections cleanly on SIGTERM (sent by the worker supervisor and orchestrators)
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+    except (NotImplementedError, AttributeError):
+        pass
     
     logger.info("Server started successfully!")
+    lag_monitor = asyncio.create_task(metrics.monitor_loop_lag())
     
     try:
         await server.wait_closed()
     finally:
-        # Shutdown HTTP server on exit
+        lag_monitor.cancel()
+        probe_task.cancel()
         logger.info("Shutting down HTTP server")
-        http_server.shutdown()
+        await health_runner.cleanup()
+        await close_clients()
+
+async def main_stdio(fledge_api=DEFAULT_FLEDGE_API, tools_file=DEFAULT_TOOLS_FILE, api_key=None,
+                     max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Serve JSON-RPC over stdin/stdout until end of input, without any network listener."""
+    logger.info(f"Serving MCP over stdio using Fledge API: {fledge_api}")
+    if hasattr(signal, "SIGHUP"):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, registry.reload_all)
+    registry.get_registry(tools_file)
+    reader, writer = await stdio.open_pipes()
+    lag_monitor = asyncio.create_task(metrics.monitor_loop_lag())
+    try:
+        await stdio.serve(
+            reader, writer,
+            lambda data, session: handle_message(data, fledge_api, tools_file, api_key, session),
+            max_concurrency
+        )
+    finally:
+        lag_monitor.cancel()
+        await close_clients()
+
+def run_worker(port, fledge_api, tools_file, api_key, http_port, max_concurrency, log_level, log_format):
+    """Entry point of a worker process in --workers mode; worker N serves health checks on http_port + N."""
+    logs.configure(log_level, log_format)
+    http_port += int(os.getenv("WORKER_ID", "0"))
+    asyncio.run(main(port, fledge_api, tools_file, api_key, http_port, max_concurrency, reuse_port=True))
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -230,6 +253,14 @@ def parse_arguments():
     parser.add_argument("--tools-file", type=str, default=DEFAULT_TOOLS_FILE, help="Path to tools JSON file")
     parser.add_argument("--api-key", type=str, help="API key for authentication")
     parser.add_argument("--log-level", type=str, default="INFO", help="Logging level")
+    parser.add_argument("--log-format", choices=("text", "json"), default=logs.DEFAULT_FORMAT,
+                        help="Log line format")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="Maximum concurrent requests per connection")
+    parser.add_argument("--transport", choices=("websocket", "stdio"), default=os.getenv("MCP_TRANSPORT", "websocket"),
+                        help="Serve WebSocket clients, or newline-delimited JSON-RPC on stdin/stdout")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", "1")),
+                        help="Worker processes sharing the listening ports (requires SO_REUSEPORT)")
     return parser.parse_args()
 
 if __name__ == "__main__":
@@ -241,7 +272,7 @@ if __name__ == "__main__":
     if not isinstance(numeric_level, int):
         print(f"Invalid log level: {args.log_level}")
         sys.exit(1)
-    logging.getLogger().setLevel(numeric_level)
+    logs.configure(numeric_level, args.log_format)
     
     # Use environment variables if not provided as arguments
     port = int(os.getenv("PORT", args.port))
@@ -251,4 +282,17 @@ if __name__ == "__main__":
     api_key = os.getenv("API_KEY", args.api_key)
     
     # Start the server
-    asyncio.run(main(port, fledge_api, tools_file, api_key, http_port)) 
\ No newline at end of file
+    if args.transport == "stdio":
+        asyncio.run(main_stdio(fledge_api, tools_file, api_key, args.max_concurrency))
+    elif args.workers > 1:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            print("--workers requires SO_REUSEPORT, which this platform does not support")
+            sys.exit(1)
+        logger.info(f"Starting {args.workers} worker processes")
+        Supervisor(
+            run_worker,
+            (port, fledge_api, tools_file, api_key, http_port, args.max_concurrency, numeric_level, args.log_format),
+            args.workers
+        ).run()
+    else:
+        asyncio.run(main(port, fledge_api, tools_file, api_key, http_port, args.max_concurrency)) 
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Prometheus metrics in the text exposition format.
+
+A small dependency-free implementation of counters, gauges and histograms
+with labels. Instruments are updated on the event loop and rendered on
+demand by the ``/metrics`` endpoint. Gauges and counters can also be backed
+by a function that is read at render time, e.g. cache statistics.
+"""
+
+import os
+import re
+import asyncio
+import logging
+from bisect import bisect_left
+
+from fledge_mcp.cache import tool_cache
+
+logger = logging.getLogger("FledgeMetrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+
+# Path segments after these prefixes are identifiers and are collapsed in labels
+_ID_SEGMENT = re.compile(r"^(/(?:asset|category|service|plugin)/)[^/]+")
+# Fledge routes reported as labels; any other path (e.g. from simulate_frontend_request) is "other"
+KNOWN_ROUTES = frozenset((
+    "/ping", "/asset", "/asset/{id}", "/category", "/category/{id}", "/service", "/service/{id}",
+    "/plugin", "/plugin/{id}", "/south/ingest",
+))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named family of labelled series."""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Yield (suffix, label values, extra labels, value) tuples."""
+        if self.function is not None:
+            yield "", (), (), self.function()
+            return
+        for key, value in list(self._values.items()):
+            yield "", key, (), value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            # Per-bucket counts (the last one is +Inf), then sum
+            series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, **labels):
+        series = self._values.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self):
+        for key, (counts, total) in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), list(counts)):
+                cumulative += count
+                yield "_bucket", key, (("le", _format_value(float(bound))),), cumulative
+            yield "_count", key, (), cumulative
+            yield "_sum", key, (), total
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=(), function=None):
+        return self._with_zero(self.register(Counter(name, documentation, labelnames, function)))
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self._with_zero(self.register(Gauge(name, documentation, labelnames, function)))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    @staticmethod
+    def _with_zero(metric):
+        """Expose unlabelled series as 0 before their first update."""
+        if not metric.labelnames and metric.function is None:
+            metric.inc(0)
+        return metric
+
+    def render(self):
+        """Render every metric in the Prometheus text format."""
+        blocks = []
+        for metric in list(self._metrics.values()):
+            try:
+                blocks.append(metric.render())
+            except Exception as e:
+                logger.error(f"Failed to render metric {metric.name}: {e}")
+        return "\n".join(blocks) + "\n"
+
+
+def path_label(path):
+    """Collapse identifiers in an API path and map unknown routes to "other" so label cardinality stays bounded."""
+    label = _ID_SEGMENT.sub(r"\1{id}", path.split("?", 1)[0])
+    return label if label in KNOWN_ROUTES else "other"
+
+
+# Shared registry and instruments for this process
+registry = MetricsRegistry()
+
+tool_calls = registry.counter("fledge_mcp_tool_calls_total", "Tool calls by tool and outcome", ("tool", "status"))
+tool_duration = registry.histogram("fledge_mcp_tool_duration_seconds", "Tool call latency", ("tool",))
+upstream_duration = registry.histogram(
+    "fledge_mcp_upstream_request_duration_seconds", "Fledge API request latency", ("method", "path"))
+upstream_responses = registry.counter(
+    "fledge_mcp_upstream_responses_total", "Fledge API responses by status code (error: no response)",
+    ("method", "path", "status"))
+upstream_retries = registry.counter(
+    "fledge_mcp_upstream_retries_total", "Fledge API requests retried after a failure", ("method",))
+upstream_rejected = registry.counter(
+    "fledge_mcp_upstream_rejected_total", "Fledge API calls failed fast by the open circuit breaker")
+admission_rejected = registry.counter(
+    "fledge_mcp_admission_rejected_total", "Tool calls rejected by admission control", ("reason",))
+span_duration = registry.histogram(
+    "fledge_mcp_span_duration_seconds", "Time spent per request phase", ("span",))
+compression_input_bytes = registry.counter(
+    "fledge_mcp_compression_input_bytes_total", "Bytes of responses before compression", ("transport",))
+compression_output_bytes = registry.counter(
+    "fledge_mcp_compression_output_bytes_total", "Bytes of responses after compression", ("transport",))
+compression_seconds = registry.counter(
+    "fledge_mcp_compression_seconds_total", "Time spent compressing responses", ("transport",))
+compression_skipped = registry.counter(
+    "fledge_mcp_compression_skipped_total", "Responses sent uncompressed for being below the size threshold",
+    ("transport",))
+compression_ratio = registry.histogram(
+    "fledge_mcp_compression_ratio", "Compressed size as a fraction of the original size", ("transport",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9, 1.0))
+requests_in_flight = registry.gauge("fledge_mcp_requests_in_flight", "Tool calls currently being processed")
+websocket_connections = registry.gauge("fledge_mcp_websocket_connections", "Open WebSocket connections")
+loop_lag = registry.gauge("fledge_mcp_event_loop_lag_seconds", "Most recent event loop scheduling delay")
+loop_lag_histogram = registry.histogram("fledge_mcp_event_loop_lag_histogram_seconds",
+                                        "Distribution of event loop scheduling delay")
+registry.counter("fledge_mcp_cache_hits_total", "Tool cache hits", function=lambda: tool_cache.hits)
+registry.counter("fledge_mcp_cache_misses_total", "Tool cache misses", function=lambda: tool_cache.misses)
+registry.counter("fledge_mcp_cache_evictions_total", "Tool cache LRU evictions", function=lambda: tool_cache.evictions)
+registry.gauge("fledge_mcp_cache_hit_ratio", "Tool cache hit ratio", function=lambda: tool_cache.stats()["hit_ratio"])
+registry.gauge("fledge_mcp_cache_entries", "Tool cache entries", function=lambda: tool_cache.stats()["entries"])
+
+
+async def monitor_loop_lag(interval=LAG_INTERVAL):
+    """Measure how late the event loop wakes up from a sleep, forever."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        loop_lag.set(lag)
+        loop_lag_histogram.observe(lag)
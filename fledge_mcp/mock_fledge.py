@@ -0,0 +1,232 @@
+"""
+Mock Fledge REST API for offline testing and benchmarking.
+
+Serves the subset of the Fledge API used by the MCP servers (``/asset``,
+``/asset/{code}``, ``/ping``, ``/service``, ``/plugin``, ``/category/core``
+and ``/south/ingest``) from an in-memory dataset built with the mock data
+generator. Latency, jitter and a random error rate can be injected to
+exercise timeouts, retries and caching. Request counters are exposed at
+``/_mock/stats``.
+
+Usage:
+    python -m fledge_mcp.mock_fledge --port 8081 --assets 10 --readings 10000 --latency 0.005
+"""
+
+import time
+import random
+import asyncio
+import logging
+import argparse
+
+import numpy as np
+from aiohttp import web
+
+from fledge_mcp.mockdata import MockGenerator
+
+logger = logging.getLogger("MockFledge")
+
+VERSION = "2.1.0"
+SERVICES = [
+    {"name": "Fledge Storage", "type": "Storage", "status": "running", "protocol": "http", "address": "localhost"},
+    {"name": "Fledge Core", "type": "Core", "status": "running", "protocol": "http", "address": "localhost"},
+    {"name": "sine", "type": "Southbound", "status": "running", "protocol": "http", "address": "localhost"},
+]
+PLUGINS = [
+    {"name": "sinusoid", "type": "south", "version": VERSION},
+    {"name": "http_south", "type": "south", "version": VERSION},
+    {"name": "OMF", "type": "north", "version": VERSION},
+]
+CORE_CONFIG = {
+    "name": {"description": "Name of this Fledge service", "type": "string", "default": "Fledge", "value": "Fledge"},
+    "description": {"description": "Description of this Fledge service", "type": "string",
+                    "default": "The Fledge administration API", "value": "The Fledge administration API"},
+}
+
+
+class MockAsset:
+    """Readings for one asset: generated columns plus readings ingested since startup."""
+
+    def __init__(self, timestamps_us, values):
+        self.timestamps_us = timestamps_us
+        self.values = values
+        self.ingested = []
+
+    @property
+    def count(self):
+        return len(self.timestamps_us) + len(self.ingested)
+
+    def page(self, limit, skip=0):
+        """Return up to limit readings, newest first, after skipping skip readings."""
+        ingested = len(self.ingested)
+        rows = []
+        if skip < ingested:
+            end = ingested - skip
+            rows = self.ingested[max(0, end - limit):end][::-1]
+        remaining = limit - len(rows)
+        generated = len(self.timestamps_us)
+        end = generated - max(0, skip - ingested)
+        if remaining > 0 and end > 0:
+            begin = max(0, end - remaining)
+            stamps = np.datetime_as_string(self.timestamps_us[begin:end][::-1].astype("datetime64[us]"), unit="us")
+            rows.extend(
+                {"reading": {"value": value}, "timestamp": stamp.replace("T", " ")}
+                for stamp, value in zip(stamps.tolist(), self.values[begin:end][::-1].tolist())
+            )
+        return rows
+
+
+class MockFledge:
+    """In-memory Fledge API with configurable dataset size, latency, jitter and error rate."""
+
+    def __init__(self, assets=10, readings=1000, latency=0.0, jitter=0.0, error_rate=0.0, seed=None,
+                 waveform="sine", sample_rate=1.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.started = time.time()
+        self.config = {key: dict(item) for key, item in CORE_CONFIG.items()}
+        self.stats = {"requests": 0, "errors": 0, "ingested": 0, "by_path": {}}
+        names = [f"sensor_{i}" for i in range(assets)]
+        generator = MockGenerator(names, readings, waveform, sample_rate=sample_rate, seed=seed)
+        timestamps, columns = next(generator.chunks(readings), (generator.timestamps_us(0, 0), {}))
+        self.assets = {name: MockAsset(timestamps, columns.get(name, np.empty(0))) for name in names}
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        """Apply injected latency and failures and count requests."""
+        if request.path.startswith("/_mock"):
+            return await handler(request)
+        self.stats["requests"] += 1
+        resource = request.match_info.route.resource
+        route = resource.canonical if resource is not None else request.path
+        self.stats["by_path"][route] = self.stats["by_path"].get(route, 0) + 1
+        delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"message": "Injected failure"}, status=500)
+        return await handler(request)
+
+    def app(self):
+        """Build the aiohttp application."""
+        app = web.Application(middlewares=[self.middleware])
+        app.add_routes([
+            web.get("/fledge/ping", self.ping),
+            web.get("/fledge/asset", self.list_assets),
+            web.get("/fledge/asset/{code}", self.asset_readings),
+            web.get("/fledge/service", self.services),
+            web.get("/fledge/plugin", self.plugins),
+            web.get("/fledge/category/core", self.get_config),
+            web.put("/fledge/category/core", self.put_config),
+            web.post("/fledge/south/ingest", self.ingest),
+            web.get("/_mock/stats", self.get_stats),
+        ])
+        return app
+
+    async def ping(self, request):
+        return web.json_response({
+            "uptime": round(time.time() - self.started, 3),
+            "dataRead": sum(asset.count for asset in self.assets.values()),
+            "dataSent": 0,
+            "dataPurged": 0,
+            "authenticationOptional": True,
+            "serviceName": "Fledge",
+            "health": "green",
+            "safeMode": False,
+            "version": VERSION,
+        })
+
+    async def list_assets(self, request):
+        return web.json_response([{"assetCode": code, "count": asset.count} for code, asset in self.assets.items()])
+
+    async def asset_readings(self, request):
+        asset = self.assets.get(request.match_info["code"])
+        try:
+            limit = int(request.query.get("limit", 20))
+            skip = int(request.query.get("skip", 0))
+        except ValueError:
+            return web.json_response({"message": "limit and skip must be integers"}, status=400)
+        if limit < 0 or skip < 0:
+            return web.json_response({"message": "limit and skip must be non-negative"}, status=400)
+        return web.json_response(asset.page(limit, skip) if asset else [])
+
+    async def services(self, request):
+        return web.json_response({"services": SERVICES})
+
+    async def plugins(self, request):
+        return web.json_response({"plugins": PLUGINS})
+
+    async def get_config(self, request):
+        return web.json_response(self.config)
+
+    async def put_config(self, request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"message": "Invalid JSON"}, status=400)
+        if not isinstance(body, dict):
+            return web.json_response({"message": "Expected an object of config items"}, status=400)
+        for key, value in body.items():
+            item = self.config.setdefault(key, {"description": key, "type": "string", "default": str(value)})
+            item["value"] = str(value)
+        return web.json_response(self.config)
+
+    async def ingest(self, request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"message": "Invalid JSON"}, status=400)
+        readings = body if isinstance(body, list) else [body]
+        for reading in readings:
+            if not isinstance(reading, dict) or "asset" not in reading or not isinstance(reading.get("readings"), dict):
+                return web.json_response({"message": "Each reading needs an asset and a readings object"}, status=400)
+        for reading in readings:
+            asset = self.assets.get(reading["asset"])
+            if asset is None:
+                asset = self.assets[reading["asset"]] = MockAsset(np.empty(0, dtype=np.int64), np.empty(0))
+            timestamp = reading.get("timestamp") or time.strftime("%Y-%m-%d %H:%M:%S")
+            asset.ingested.append({"reading": reading["readings"], "timestamp": timestamp})
+        self.stats["ingested"] += len(readings)
+        return web.json_response({"result": "success"})
+
+    async def get_stats(self, request):
+        return web.json_response(self.stats)
+
+
+async def start(mock, host="127.0.0.1", port=0):
+    """Serve mock in the running loop and return (runner, base_url); port 0 picks a free port."""
+    runner = web.AppRunner(mock.app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{port}/fledge"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Mock Fledge REST API")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to listen on")
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    parser.add_argument("--assets", type=int, default=10, help="Number of assets in the dataset")
+    parser.add_argument("--readings", type=int, default=1000, help="Readings generated per asset")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument("--seed", type=int, help="Seed for the dataset and injected failures")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the mock Fledge API until interrupted."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    mock = MockFledge(args.assets, args.readings, args.latency, args.jitter, args.error_rate, args.seed)
+    logger.info(f"Mock Fledge API with {args.assets} assets x {args.readings} readings on {args.host}:{args.port}")
+    web.run_app(mock.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
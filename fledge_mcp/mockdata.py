@@ -0,0 +1,212 @@
+"""
+Vectorised mock sensor data for ``generate_mock_data``.
+
+Values are computed with NumPy a chunk at a time from seeded generators, so a
+given seed produces the same series whatever the chunk size. Supported
+waveforms are sine, random walk, square step and pure noise, with optional
+Gaussian noise and spike anomalies on top. Samples are evenly spaced at a
+fixed sample rate.
+
+Results come as rows (``{"asset", "timestamp", "readings"}`` like Fledge) or
+as columns (epoch-millisecond timestamps plus one value list per sensor).
+Counts above the inline limit are streamed in chunks.
+"""
+
+import os
+import asyncio
+from datetime import datetime, timezone
+
+import numpy as np
+
+WAVEFORMS = ("sine", "random_walk", "step", "noise")
+FORMATS = ("rows", "columnar")
+DEFAULT_CHUNK_SIZE = int(os.getenv("MOCK_CHUNK_SIZE", "100000"))
+INLINE_LIMIT = int(os.getenv("MOCK_INLINE_LIMIT", "200000"))
+MAX_SENSORS = 1000
+# Samples per sensor in one call; bounds how long a streamed call holds its slots
+MAX_COUNT = int(os.getenv("MOCK_MAX_COUNT", "10000000"))
+
+
+class MockGenerator:
+    """Seeded generator for evenly sampled readings of one or more sensors."""
+
+    def __init__(self, sensors, count, waveform="sine", sample_rate=1.0, start=None, seed=None,
+                 amplitude=5.0, offset=25.0, period=60.0, noise=0.0, anomaly_rate=0.0, anomaly_scale=5.0):
+        self.sensors = list(sensors)
+        self.count = count
+        self.waveform = waveform
+        self.sample_rate = float(sample_rate)
+        self.amplitude = float(amplitude)
+        self.offset = float(offset)
+        self.period = float(period)
+        self.noise = float(noise)
+        self.anomaly_rate = float(anomaly_rate)
+        self.anomaly_scale = float(anomaly_scale)
+        if start is None:
+            # End the series at the current time
+            start = datetime.now(timezone.utc).timestamp() - (count - 1) / self.sample_rate
+        self.start_us = int(round(start * 1e6))
+        if seed is None:
+            # Pick a small seed so the reported value round-trips through JSON clients
+            seed = int(np.random.default_rng().integers(2 ** 32))
+        self.seed = seed
+        sequence = np.random.SeedSequence(seed)
+        # Independent streams per sensor and purpose keep output independent of chunking
+        self._rngs = [[np.random.default_rng(s) for s in child.spawn(3)] for child in sequence.spawn(len(self.sensors))]
+        self._walk = [self.offset] * len(self.sensors)
+        self._position = 0
+
+    @property
+    def points(self):
+        """Total number of readings across all sensors."""
+        return self.count * len(self.sensors)
+
+    def timestamps_us(self, begin, end):
+        """Epoch-microsecond timestamps for samples begin..end."""
+        index = np.arange(begin, end, dtype=np.int64)
+        return self.start_us + np.round(index * (1e6 / self.sample_rate)).astype(np.int64)
+
+    def _values(self, sensor, begin, end):
+        """Values for one sensor's samples begin..end."""
+        n = end - begin
+        walk_rng, noise_rng, anomaly_rng = self._rngs[sensor]
+        if self.waveform == "sine":
+            t = np.arange(begin, end, dtype=float) / self.sample_rate
+            values = self.offset + self.amplitude * np.sin(2 * np.pi * t / self.period)
+        elif self.waveform == "step":
+            samples_per_half = max(1, int(self.period * self.sample_rate / 2))
+            levels = (np.arange(begin, end) // samples_per_half) % 2
+            values = self.offset + self.amplitude * (2 * levels - 1)
+        elif self.waveform == "random_walk":
+            steps = walk_rng.normal(0, self.amplitude / 10, n)
+            values = self._walk[sensor] + np.cumsum(steps)
+            if n:
+                self._walk[sensor] = values[-1]
+        else:
+            values = self.offset + self.amplitude * walk_rng.standard_normal(n)
+        if self.noise:
+            values = values + noise_rng.normal(0, self.noise, n)
+        if self.anomaly_rate:
+            draws = anomaly_rng.random(n)
+            spikes = np.where(draws < self.anomaly_rate / 2, 1.0, -1.0) * self.anomaly_scale * self.amplitude
+            values = np.where(draws < self.anomaly_rate, values + spikes, values)
+        return values
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield (timestamps_us, {sensor: values}) for successive chunks of samples."""
+        while self._position < self.count:
+            begin = self._position
+            end = min(self.count, begin + chunk_size)
+            self._position = end
+            columns = {name: self._values(i, begin, end) for i, name in enumerate(self.sensors)}
+            yield self.timestamps_us(begin, end), columns
+
+
+def _number(params, name, default, minimum=None, exclusive=False):
+    """Read a numeric parameter, raising ValueError if it is out of range."""
+    value = params.get(name, default)
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError(f"{name} must be a number")
+    if minimum is not None and (value <= minimum if exclusive else value < minimum):
+        raise ValueError(f"{name} must be {'>' if exclusive else '>='} {minimum}")
+    return value
+
+
+def from_params(params):
+    """Build a MockGenerator from tool parameters, raising ValueError if they are invalid."""
+    sensors = params.get("sensors")
+    if sensors is None:
+        sensors = [params.get("sensor_id", "mock_sensor")]
+    if not isinstance(sensors, list) or not sensors or not all(isinstance(s, str) for s in sensors):
+        raise ValueError("sensors must be a non-empty list of names")
+    if len(sensors) > MAX_SENSORS:
+        raise ValueError(f"at most {MAX_SENSORS} sensors are supported")
+    count = params.get("count", 10)
+    if not isinstance(count, int) or isinstance(count, bool) or not 0 <= count <= MAX_COUNT:
+        raise ValueError(f"count must be an integer between 0 and {MAX_COUNT}")
+    waveform = params.get("waveform", "sine")
+    if waveform not in WAVEFORMS:
+        raise ValueError(f"waveform must be one of {', '.join(WAVEFORMS)}")
+    start = params.get("start")
+    if start is not None:
+        try:
+            parsed = datetime.fromisoformat(start)
+        except (TypeError, ValueError):
+            raise ValueError("start must be an ISO 8601 timestamp")
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        start = parsed.timestamp()
+    anomaly_rate = _number(params, "anomaly_rate", 0.0, 0)
+    if anomaly_rate > 1:
+        raise ValueError("anomaly_rate must be between 0 and 1")
+    return MockGenerator(
+        sensors, count, waveform,
+        sample_rate=_number(params, "sample_rate", 1.0, 0, exclusive=True),
+        start=start,
+        seed=params.get("seed"),
+        amplitude=_number(params, "amplitude", 5.0),
+        offset=_number(params, "offset", 25.0),
+        period=_number(params, "period", 60.0, 0, exclusive=True),
+        noise=_number(params, "noise", 0.0, 0),
+        anomaly_rate=anomaly_rate,
+        anomaly_scale=_number(params, "anomaly_scale", 5.0),
+    )
+
+
+def format_from_params(params):
+    """Return the requested output format, raising ValueError if it is unknown."""
+    fmt = params.get("format", "rows")
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def should_stream(params, generator):
+    """Return True if the result should be streamed rather than returned inline."""
+    return bool(params.get("stream")) or generator.points > INLINE_LIMIT
+
+
+def to_rows(timestamps_us, columns):
+    """Fledge-style rows, ordered by time then sensor."""
+    stamps = np.datetime_as_string(timestamps_us.astype("datetime64[us]"), unit="us").tolist()
+    series = [(name, values.tolist()) for name, values in columns.items()]
+    return [
+        {"asset": name, "timestamp": stamp, "readings": {"value": values[i]}}
+        for i, stamp in enumerate(stamps)
+        for name, values in series
+    ]
+
+
+def to_columnar(timestamps_us, columns):
+    """Epoch-millisecond timestamps and one value list per sensor."""
+    return {
+        "timestamps": (timestamps_us // 1000).tolist(),
+        "sensors": {name: values.tolist() for name, values in columns.items()},
+    }
+
+
+def render(generator, fmt="rows"):
+    """Generate the whole series in one response."""
+    empty = (generator.timestamps_us(0, 0), {name: np.empty(0) for name in generator.sensors})
+    timestamps, columns = next(generator.chunks(generator.count), empty)
+    if fmt == "columnar":
+        return {"seed": generator.seed, "sample_rate": generator.sample_rate, **to_columnar(timestamps, columns)}
+    return to_rows(timestamps, columns)
+
+
+async def iter_pages(generator, fmt="rows", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield pages for the streaming helpers: rows, or a single columnar chunk per page."""
+    for timestamps, columns in generator.chunks(chunk_size):
+        if fmt == "columnar":
+            yield [to_columnar(timestamps, columns)]
+        else:
+            yield to_rows(timestamps, columns)
+        # Let other connections run between chunks
+        await asyncio.sleep(0)
+
+
+def page_points(page):
+    """Number of readings in a page produced by iter_pages."""
+    if page and "sensors" in page[0]:
+        return sum(len(values) for values in page[0]["sensors"].values())
+    return len(page)
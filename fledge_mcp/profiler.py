@@ -0,0 +1,58 @@
+"""
+On-demand sampling profiler.
+
+Samples the stack of one thread (normally the event loop's) from a
+background thread with ``sys._current_frames`` at a fixed interval, for a
+bounded duration. The result is reported in the collapsed stack format
+(``outer;inner;leaf count``) read by flamegraph.pl and speedscope. Nothing
+is installed into the profiled thread, so it runs at full speed apart from
+the sampler holding the GIL briefly at each tick.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter
+
+DEFAULT_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+MAX_SECONDS = 60.0
+
+
+def _label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Collects stack samples of a thread."""
+
+    def __init__(self, thread_id=None, interval=DEFAULT_INTERVAL):
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.samples = 0
+        self.stacks = Counter()
+
+    def sample(self):
+        """Record the target thread's current stack once."""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            stack.append(_label(frame))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def run(self, seconds):
+        """Sample for seconds (capped at MAX_SECONDS); blocks the calling thread."""
+        deadline = time.perf_counter() + min(seconds, MAX_SECONDS)
+        while time.perf_counter() < deadline:
+            self.sample()
+            time.sleep(self.interval)
+        return self
+
+    def collapsed(self):
+        """Stacks in collapsed format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
@@ -0,0 +1,110 @@
+"""
+Cached tool catalog.
+
+The tool definitions file is parsed once into an immutable registry, each
+tool's parameter schema is compiled into a validator and the ``tools/list``
+result is serialized once. The file is re-read only when its
+modification time changes (checked at most once per interval) or when
+``reload()`` is called, e.g. from a SIGHUP handler.
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from types import MappingProxyType
+
+from fledge_mcp import codec
+from fledge_mcp.validation import compile_validator
+
+logger = logging.getLogger("FledgeToolRegistry")
+
+DEFAULT_TOOLS_FILE = str(Path(__file__).parent / "smithery.json")
+DEFAULT_CHECK_INTERVAL = float(os.getenv("TOOLS_CHECK_INTERVAL", "1"))
+
+
+class ToolRegistry:
+    """Immutable snapshot of a tools file with a pre-serialized tools/list result."""
+
+    def __init__(self, path=DEFAULT_TOOLS_FILE, check_interval=DEFAULT_CHECK_INTERVAL, clock=time.monotonic):
+        self.path = str(path)
+        self.check_interval = check_interval
+        self.clock = clock
+        self.tools = ()
+        self.by_name = MappingProxyType({})
+        self.validators = MappingProxyType({})
+        self._result = None
+        self._encoded_result = codec.dumps({"tools": []})
+        self._mtime = None
+        self._checked_at = None
+        self.reload()
+
+    def reload(self):
+        """Re-read the tools file; on failure the previous catalog is kept."""
+        mtime = None
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, "rb") as f:
+                config = codec.loads(f.read())
+            tools = tuple(config.get("tools", []) if isinstance(config, dict) else config)
+            by_name = {tool["name"]: tool for tool in tools}
+            validators = {name: compile_validator(tool.get("parameters")) for name, tool in by_name.items()}
+        except Exception as e:
+            logger.error(f"Failed to load tools from {self.path}: {e}")
+            # Remember the broken version so it is not re-read until it changes again
+            if mtime is not None:
+                self._mtime = mtime
+            self._checked_at = self.clock()
+            return False
+        self.tools = tools
+        self.by_name = MappingProxyType(by_name)
+        self.validators = MappingProxyType(validators)
+        self._result = {"tools": list(self.tools)}
+        self._encoded_result = codec.dumps(self._result)
+        self._mtime = mtime
+        self._checked_at = self.clock()
+        logger.info(f"Loaded {len(self.tools)} tools from {self.path}")
+        return True
+
+    def refresh(self):
+        """Reload if the file's mtime changed since the last check."""
+        now = self.clock()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        mtime = None
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def tools_list_response(self, msg_id):
+        """Return the tools/list JSON-RPC response with its body pre-serialized."""
+        self.refresh()
+        message = {"jsonrpc": "2.0", "result": self._result or {"tools": []}, "id": msg_id}
+        encoded = b'{"jsonrpc":"2.0","result":' + self._encoded_result + b',"id":' + codec.dumps(msg_id) + b"}"
+        return codec.Encoded(message, encoded)
+
+
+# One registry per tools file
+_registries = {}
+
+
+def get_registry(path=None):
+    """Return the shared registry for a tools file (defaults to TOOLS_FILE or the bundled smithery.json)."""
+    if path is None:
+        path = os.getenv("TOOLS_FILE", DEFAULT_TOOLS_FILE)
+    path = str(path)
+    registry = _registries.get(path)
+    if registry is None:
+        registry = ToolRegistry(path)
+        _registries[path] = registry
+    return registry
+
+
+def reload_all():
+    """Reload every registry, e.g. on SIGHUP."""
+    for registry in _registries.values():
+        registry.reload()
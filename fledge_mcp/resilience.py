@@ -0,0 +1,90 @@
+"""
+Circuit breaker and retry backoff for upstream Fledge calls.
+
+The breaker opens after a run of consecutive upstream failures (connection
+errors, timeouts, 5xx responses) and then rejects calls immediately instead
+of letting each one wait for a timeout. Once the reset timeout has passed it
+lets a single trial call through (half-open); success closes it again, and
+failure reopens it for another reset period.
+"""
+
+import os
+import time
+import random
+
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv("FLEDGE_BREAKER_THRESHOLD", "5"))
+DEFAULT_RESET_TIMEOUT = float(os.getenv("FLEDGE_BREAKER_RESET", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream."""
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self._trial = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return CLOSED
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def retry_after(self):
+        """Seconds until an open breaker allows a trial call."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def allow(self):
+        """Return True if a call may go upstream now."""
+        state = self.state
+        if state == CLOSED or (state == HALF_OPEN and not self._trial):
+            self._trial = state == HALF_OPEN
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                self.trips += 1
+            self.opened_at = self.clock()
+        self._trial = False
+
+    def release(self):
+        """End a call that neither succeeded nor failed upstream (e.g. cancelled)."""
+        self._trial = False
+
+    def status(self):
+        """Breaker state for health and diagnostic responses."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 3)
+        }
+
+
+def backoff_delay(attempt, base, cap, rng=random):
+    """Full-jitter exponential backoff before retry number attempt (0-based)."""
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,112 @@
+"""
+Per-connection JSON-RPC session handling.
+
+A session reads frames from a transport, dispatches every request as its own
+task (bounded by a per-connection concurrency limit; each call in a batch
+takes its own slot) and sends each response as soon as it is ready.
+Responses are matched to requests by their ``id``.
+Handlers receive the session so they can push notifications to the client.
+"""
+
+import os
+import asyncio
+import logging
+
+from fledge_mcp import codec, tracing
+from fledge_mcp.admission import admission_controller
+
+logger = logging.getLogger("FledgeMCPSession")
+
+# Maximum number of requests processed concurrently on a single connection
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENT_REQUESTS", "16"))
+# Send encoded JSON as binary frames instead of text frames
+DEFAULT_BINARY_FRAMES = os.getenv("WS_BINARY_FRAMES", "0").lower() in ("1", "true", "yes")
+
+
+class Session:
+    """Dispatches JSON-RPC messages from one client concurrently."""
+
+    def __init__(self, send, handler, max_concurrency=DEFAULT_MAX_CONCURRENCY, binary=DEFAULT_BINARY_FRAMES):
+        self._send = send
+        self._binary = binary
+        self._handler = handler
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._tasks = set()
+
+    async def send(self, message):
+        """Serialize and send a message to the client."""
+        with tracing.span("encode"):
+            data = codec.dumps(message)
+        with tracing.span("send"):
+            await self._send(data if self._binary else data.decode("utf-8"))
+
+    async def notify(self, method, params):
+        """Send a JSON-RPC notification to the client."""
+        await self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def dispatch(self, raw):
+        """Parse a raw frame and schedule it; waits while the connection is at its limit."""
+        # The frame's trace is inherited by the task processing it
+        token = tracing.activate(tracing.Trace())
+        try:
+            try:
+                with tracing.span("decode"):
+                    data = codec.loads(raw)
+            except codec.JSONDecodeError:
+                await self.send({
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32700, "message": "Parse error"},
+                    "id": None
+                })
+                return
+
+            # The calls of a batch wait for their own slots in limited(), so the batch takes none
+            slotted = not isinstance(data, list)
+            if slotted:
+                await self._semaphore.acquire()
+            task = asyncio.create_task(self._process(data))
+            self._tasks.add(task)
+            task.add_done_callback(lambda done: self._task_done(done, slotted))
+        finally:
+            tracing.deactivate(token)
+
+    def _task_done(self, task, slotted=True):
+        self._tasks.discard(task)
+        if slotted:
+            self._semaphore.release()
+
+    async def limited(self, call):
+        """Await one call of a batch once a concurrency slot is free."""
+        async with self._semaphore:
+            return await call
+
+    async def _process(self, data):
+        """Run the handler for one message and send its response."""
+        try:
+            response = await self._handler(data, self)
+        except Exception as e:
+            logger.error(f"Error processing message: {str(e)}")
+            response = {
+                "jsonrpc": "2.0",
+                "error": {"code": -32000, "message": str(e)},
+                "id": data.get("id") if isinstance(data, dict) else None
+            }
+        if response is None:
+            return
+        try:
+            await self.send(response)
+        except Exception as e:
+            logger.debug("Could not send response: %s", e)
+
+    async def drain(self):
+        """Wait for the requests in flight to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def close(self):
+        """Cancel requests still in flight when the client goes away."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        admission_controller.forget(id(self))
@@ -0,0 +1,108 @@
+"""
+Newline-delimited JSON-RPC over stdin and stdout.
+
+For MCP clients that launch the server as a local subprocess. Each line on
+stdin is one JSON-RPC message (or batch) and each response or notification
+is written to stdout as one line; logs go to stderr. Stdout may be a pipe or
+a regular file, which is written from a worker thread. Messages are dispatched
+through the same ``Session`` as WebSocket connections, so requests are
+processed concurrently and responses are written as they complete. At end
+of input, requests still in flight are finished before returning.
+"""
+
+import os
+import sys
+import stat
+import asyncio
+import logging
+
+from fledge_mcp.session import Session, DEFAULT_MAX_CONCURRENCY
+from fledge_mcp.subscriptions import subscription_manager
+
+logger = logging.getLogger("FledgeMCPStdio")
+
+# Longest accepted input line in bytes
+DEFAULT_LINE_LIMIT = int(os.getenv("STDIO_LINE_LIMIT", str(16 * 1024 * 1024)))
+
+
+class FileWriter:
+    """Writer for a stdout redirected to a regular file, which pipe transports do not support."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = []
+        self._lock = asyncio.Lock()
+
+    def write(self, data):
+        self._buffer.append(data)
+
+    async def drain(self):
+        # The lock keeps concurrent drains from writing out of order
+        async with self._lock:
+            if not self._buffer:
+                return
+            data = b"".join(self._buffer)
+            self._buffer.clear()
+            await asyncio.get_running_loop().run_in_executor(None, self._write, data)
+
+    def _write(self, data):
+        self._stream.write(data)
+        self._stream.flush()
+
+
+async def open_pipes(stdin=None, stdout=None, limit=DEFAULT_LINE_LIMIT):
+    """Wrap stdin and stdout in asyncio streams."""
+    loop = asyncio.get_running_loop()
+    stdout = stdout or sys.stdout
+    reader = asyncio.StreamReader(limit=limit)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stdin or sys.stdin)
+    if stat.S_ISREG(os.fstat(stdout.fileno()).st_mode):
+        return reader, FileWriter(getattr(stdout, "buffer", stdout))
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, stdout)
+    writer = asyncio.StreamWriter(transport, protocol, None, loop)
+    return reader, writer
+
+
+async def read_line(reader):
+    """Return the next line (b"" at end of input), or None for a line over the limit, which is skipped."""
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError:
+        pass
+    # Discard the rest of the oversized line so its tail is not read as a message
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return None
+
+
+async def serve(reader, writer, handler, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Answer JSON-RPC lines from reader on writer until end of input."""
+
+    async def send(data):
+        writer.write(data + b"\n")
+        await writer.drain()
+
+    session = Session(send, handler, max_concurrency, binary=True)
+    try:
+        while True:
+            line = await read_line(reader)
+            if line is None:
+                logger.error("Input line too long")
+                await session.send({"jsonrpc": "2.0", "error": {"code": -32700, "message": "Parse error"}, "id": None})
+                continue
+            if not line:
+                break
+            if line.strip():
+                await session.dispatch(line)
+        await session.drain()
+    finally:
+        subscription_manager.unsubscribe_all(session)
+        await session.close()
+    return session
@@ -0,0 +1,110 @@
+"""
+Streaming delivery of large get_sensor_data results.
+
+Readings are fetched from Fledge a page at a time (``limit``/``skip``) and
+each page is forwarded to the client before the next one is requested, so
+peak memory is bounded by the page size rather than the total result size.
+WebSocket clients receive pages as ``notifications/progress`` notifications;
+HTTP clients receive one chunked JSON array.
+"""
+
+import os
+import uuid
+import logging
+
+from aiohttp import web
+
+from fledge_mcp import codec
+
+logger = logging.getLogger("FledgeStreaming")
+
+PROGRESS_METHOD = "notifications/progress"
+DEFAULT_PAGE_SIZE = int(os.getenv("STREAM_PAGE_SIZE", "1000"))
+MAX_PAGE_SIZE = 10000
+
+
+def requested(params):
+    """Return True if the tool parameters ask for a streamed result."""
+    return bool(params.get("stream"))
+
+
+def page_size_from_params(params):
+    """Return the requested page size, raising ValueError if it is out of range."""
+    page_size = params.get("page_size", DEFAULT_PAGE_SIZE)
+    if not isinstance(page_size, int) or not 0 < page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be an integer between 1 and {MAX_PAGE_SIZE}")
+    return page_size
+
+
+async def iter_pages(client, sensor_id, limit, page_size=DEFAULT_PAGE_SIZE, time_range=None):
+    """Yield pages of readings for a sensor until limit readings have been fetched."""
+    skip = 0
+    while skip < limit:
+        size = min(page_size, limit - skip)
+        query = {"limit": size, "skip": skip}
+        if time_range:
+            query["time_range"] = time_range
+        page = await client.get(f"/asset/{sensor_id}", params=query, raise_for_status=True)
+        if not isinstance(page, list):
+            raise ValueError(f"Unexpected response for {sensor_id}: {str(page)[:200]}")
+        if not page:
+            return
+        yield page
+        skip += len(page)
+        if len(page) < size:
+            return
+
+
+async def stream_to_session(session, pages, progress_token=None, total=None, measure=len):
+    """Send each page as a progress notification and return a summary for the final response.
+
+    measure returns the number of readings in a page.
+    """
+    token = progress_token if progress_token is not None else str(uuid.uuid4())
+    count = 0
+    page_count = 0
+    async for page in pages:
+        count += measure(page)
+        page_count += 1
+        await session.notify(PROGRESS_METHOD, {
+            "progressToken": token,
+            "progress": count,
+            "total": total,
+            "readings": page
+        })
+    return {"streamed": True, "progressToken": token, "count": count, "pages": page_count}
+
+
+def _encode_page(page):
+    return b",".join(codec.dumps(reading) for reading in page)
+
+
+async def stream_to_response(request, pages):
+    """Write pages to an HTTP client as a single chunked JSON array.
+
+    The first page is fetched before the headers are sent, so an error there
+    propagates to the caller and is answered with a proper error status.
+    """
+    pages = pages.__aiter__()
+    try:
+        first = await pages.__anext__()
+    except StopAsyncIteration:
+        first = None
+    response = web.StreamResponse(headers={"Content-Type": "application/json"})
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    if first is None:
+        await response.write(b"[]")
+        await response.write_eof()
+        return response
+    await response.write(b"[" + _encode_page(first))
+    try:
+        async for page in pages:
+            await response.write(b"," + _encode_page(page))
+    except Exception as e:
+        # Headers are already sent; a truncated array tells the client the stream failed
+        logger.error(f"Streaming aborted: {str(e)}")
+        return response
+    await response.write(b"]")
+    await response.write_eof()
+    return response
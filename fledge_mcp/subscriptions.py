@@ -0,0 +1,127 @@
+"""
+Push-based sensor subscriptions.
+
+One poller task runs per subscribed sensor, however many clients subscribe
+to it. Each new reading is fanned out to every subscriber as a JSON-RPC
+notification. Pollers stop when their last subscriber leaves.
+"""
+
+import os
+import asyncio
+import logging
+
+from fledge_mcp.fledge_client import get_client
+from fledge_mcp.timeseries import sensor_store
+
+logger = logging.getLogger("FledgeSubscriptions")
+
+NOTIFICATION_METHOD = "notifications/sensor_reading"
+MIN_INTERVAL = float(os.getenv("SUBSCRIPTION_MIN_INTERVAL", "1"))
+# Readings fetched per poll so the local store keeps a contiguous history
+POLL_WINDOW = int(os.getenv("SUBSCRIPTION_POLL_WINDOW", "100"))
+
+
+async def fetch_latest_reading(sensor_id):
+    """Fetch the most recent reading for a sensor from Fledge, refreshing the local store."""
+    limit = POLL_WINDOW if sensor_store.enabled else 1
+    readings = await get_client().get(f"/asset/{sensor_id}", params={"limit": limit})
+    sensor_store.sync(sensor_id, readings)
+    return readings[0] if readings else None
+
+
+class SensorPoller:
+    """Polls one sensor and fans readings out to its subscribers."""
+
+    def __init__(self, manager, sensor_id):
+        self.manager = manager
+        self.sensor_id = sensor_id
+        self.subscribers = {}
+        self.last_reading = None
+        self.task = None
+        # Catch-up publishes to new subscribers, kept so they are not garbage collected
+        self.pending = set()
+
+    @property
+    def interval(self):
+        """Poll at the fastest interval any subscriber asked for."""
+        return max(MIN_INTERVAL, min(self.subscribers.values(), default=MIN_INTERVAL))
+
+    async def run(self):
+        """Poll until cancelled."""
+        while self.subscribers:
+            try:
+                reading = await self.manager.fetch(self.sensor_id)
+                if reading is not None and reading != self.last_reading:
+                    self.last_reading = reading
+                    await self.publish(reading)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Polling {self.sensor_id} failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def publish(self, reading, subscribers=None):
+        """Send a reading to subscribers, dropping any whose connection is gone."""
+        targets = list(subscribers or self.subscribers)
+        results = await asyncio.gather(
+            *(subscriber.notify(NOTIFICATION_METHOD, {"sensor_id": self.sensor_id, "reading": reading})
+              for subscriber in targets),
+            return_exceptions=True
+        )
+        for subscriber, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.info(f"Dropping subscriber of {self.sensor_id}: {str(result)}")
+                self.manager.unsubscribe(self.sensor_id, subscriber)
+
+
+class SubscriptionManager:
+    """Tracks subscribers per sensor and owns the shared pollers."""
+
+    def __init__(self, fetch=fetch_latest_reading):
+        self.fetch = fetch
+        self._pollers = {}
+
+    def subscribe(self, sensor_id, subscriber, interval=5):
+        """Subscribe a client to a sensor; starts the sensor's poller if needed."""
+        poller = self._pollers.get(sensor_id)
+        if poller is None:
+            poller = SensorPoller(self, sensor_id)
+            self._pollers[sensor_id] = poller
+        poller.subscribers[subscriber] = interval
+        if poller.task is None:
+            poller.task = asyncio.create_task(poller.run())
+        elif poller.last_reading is not None:
+            task = asyncio.create_task(poller.publish(poller.last_reading, [subscriber]))
+            poller.pending.add(task)
+            task.add_done_callback(poller.pending.discard)
+        return poller.interval
+
+    def unsubscribe(self, sensor_id, subscriber):
+        """Remove a subscription; stops the poller when nobody is left. Returns True if it existed."""
+        poller = self._pollers.get(sensor_id)
+        if poller is None or poller.subscribers.pop(subscriber, None) is None:
+            return False
+        if not poller.subscribers:
+            del self._pollers[sensor_id]
+            for task in [poller.task, *poller.pending]:
+                if task is not None and task is not asyncio.current_task():
+                    task.cancel()
+        return True
+
+    def unsubscribe_all(self, subscriber):
+        """Remove every subscription held by a client, e.g. on disconnect."""
+        for sensor_id in list(self._pollers):
+            self.unsubscribe(sensor_id, subscriber)
+
+    def subscriber_count(self, sensor_id):
+        """Return the number of clients subscribed to a sensor."""
+        poller = self._pollers.get(sensor_id)
+        return len(poller.subscribers) if poller else 0
+
+    def sensors(self):
+        """Return the sensors that currently have pollers."""
+        return list(self._pollers)
+
+
+# Shared subscription manager for all WebSocket connections
+subscription_manager = SubscriptionManager()
@@ -0,0 +1,120 @@
+"""
+Multi-process worker supervisor.
+
+Runs N copies of a worker function in spawned processes, each with its own
+interpreter and event loop. Workers bind the same listening port with
+SO_REUSEPORT so the kernel spreads connections across them. The supervisor restarts
+workers that exit unexpectedly, backing off when they crash repeatedly. It
+forwards SIGHUP to every worker and, on SIGTERM or SIGINT, stops them with
+SIGTERM, killing any that do not exit within the shutdown timeout.
+"""
+
+import os
+import time
+import signal
+import logging
+import multiprocessing
+
+logger = logging.getLogger("FledgeSupervisor")
+
+DEFAULT_SHUTDOWN_TIMEOUT = float(os.getenv("WORKER_SHUTDOWN_TIMEOUT", "10"))
+DEFAULT_RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+# A worker that ran at least this long is considered healthy when it exits
+STABLE_UPTIME = 10.0
+
+
+def _worker_entry(target, slot, args):
+    """Run target in a worker process; the supervisor coordinates Ctrl-C."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ["WORKER_ID"] = str(slot)
+    target(*args)
+
+
+class Supervisor:
+    """Keeps a fixed number of worker processes running until stopped."""
+
+    def __init__(self, target, args=(), workers=2, shutdown_timeout=DEFAULT_SHUTDOWN_TIMEOUT,
+                 restart_delay=DEFAULT_RESTART_DELAY, poll_interval=0.5):
+        self.target = target
+        self.args = tuple(args)
+        self.workers = workers
+        self.shutdown_timeout = shutdown_timeout
+        self.restart_delay = restart_delay
+        self.poll_interval = poll_interval
+        self.context = multiprocessing.get_context("spawn")
+        self.processes = [None] * workers
+        self.restarts = 0
+        self._started_at = [0.0] * workers
+        self._restart_at = [0.0] * workers
+        self._failures = [0] * workers
+        self._stopping = False
+
+    def _spawn(self, slot):
+        process = self.context.Process(
+            target=_worker_entry, args=(self.target, slot, self.args), name=f"fledge-mcp-worker-{slot}"
+        )
+        process.start()
+        self.processes[slot] = process
+        self._started_at[slot] = time.monotonic()
+        logger.info(f"Started worker {slot} (pid {process.pid})")
+
+    def _reap(self):
+        """Notice exited workers and restart them when their backoff has elapsed."""
+        now = time.monotonic()
+        for slot, process in enumerate(self.processes):
+            if process is None:
+                if now >= self._restart_at[slot] and not self._stopping:
+                    self._spawn(slot)
+                continue
+            if process.is_alive():
+                continue
+            if now - self._started_at[slot] >= STABLE_UPTIME:
+                self._failures[slot] = 1
+            else:
+                self._failures[slot] += 1
+            delay = min(self.restart_delay * 2 ** (self._failures[slot] - 1), MAX_RESTART_DELAY)
+            logger.warning(f"Worker {slot} (pid {process.pid}) exited with code {process.exitcode}; "
+                           f"restarting in {delay:.1f}s")
+            self.processes[slot] = None
+            self._restart_at[slot] = now + delay
+            self.restarts += 1
+
+    def broadcast(self, signum):
+        """Send a signal to every running worker."""
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                os.kill(process.pid, signum)
+
+    def stop(self):
+        """Ask the supervisor loop to shut the workers down."""
+        self._stopping = True
+
+    def _shutdown(self):
+        alive = [p for p in self.processes if p is not None and p.is_alive()]
+        logger.info(f"Stopping {len(alive)} workers")
+        for process in alive:
+            process.terminate()
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in alive:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker pid {process.pid} did not stop in time; killing it")
+                process.kill()
+                process.join()
+
+    def run(self, install_signals=True):
+        """Start the workers and supervise them until stop() or SIGTERM/SIGINT."""
+        if install_signals:
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+            signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
+            if hasattr(signal, "SIGHUP"):
+                signal.signal(signal.SIGHUP, lambda signum, frame: self.broadcast(signal.SIGHUP))
+        for slot in range(self.workers):
+            self._spawn(slot)
+        try:
+            while not self._stopping:
+                self._reap()
+                time.sleep(self.poll_interval)
+        finally:
+            self._shutdown()
@@ -0,0 +1,70 @@
+"""Shared test fixtures."""
+
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+
+class Clock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Recorder:
+    """Session stand-in that records notifications."""
+
+    def __init__(self):
+        self.notifications = []
+
+    async def notify(self, method, params):
+        self.notifications.append((method, params))
+
+
+class FakeSocket:
+    """Collects frames sent by a session."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def socket():
+    return FakeSocket()
+
+
+@pytest_asyncio.fixture
+async def serve():
+    """Start aiohttp apps on free local ports; returns (runner, base_url + path). Stopped after the test."""
+    runners = []
+
+    async def start(app, path=""):
+        runner = web.AppRunner(app)
+        await runner.setup()
+        runners.append(runner)
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}{path}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
@@ -0,0 +1,107 @@
+"""Tests for admission control and load shedding."""
+
+import asyncio
+
+import pytest
+
+from fledge_mcp import admission, handlers
+from fledge_mcp import session as session_module
+from fledge_mcp.admission import AdmissionController, ServerBusy, TokenBucket
+from fledge_mcp.handlers import ToolContext, ToolError, call_tool
+from fledge_mcp.session import Session
+
+
+def test_token_bucket_refills_and_charges_costs(clock):
+    bucket = TokenBucket(rate=10, burst=20, clock=clock)
+    assert bucket.take(15) == 0
+    assert bucket.take(10) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.take(10) == 0
+    # Calls costing more than the burst are capped so they can eventually run
+    assert bucket.take(100) == pytest.approx(2.0)
+
+
+def test_parse_limits_overrides_defaults():
+    limits = admission.parse_limits(" ingest_test_data=20, get_api_schema=0.5 ,", {"ingest_test_data": 10, "x": 1})
+    assert limits == {"ingest_test_data": 20.0, "x": 1, "get_api_schema": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_per_client_rate_limits_use_tool_costs():
+    controller = AdmissionController(rate=1, burst=10, costs={"ingest_test_data": 10}, lag=lambda: 0.0)
+    await controller.acquire("a", "ingest_test_data")
+    controller.release("ingest_test_data")
+    with pytest.raises(ServerBusy) as excinfo:
+        await controller.acquire("a", "get_api_schema")
+    assert excinfo.value.reason == "rate_limited" and excinfo.value.retry_after > 0
+    # Other clients have their own budget; unidentified callers are not rate limited
+    await controller.acquire("b", "get_api_schema")
+    await controller.acquire(None, "get_api_schema")
+    assert controller.inflight == 2
+
+
+@pytest.mark.asyncio
+async def test_queue_is_fifo_bounded_and_respects_tool_limits():
+    controller = AdmissionController(rate=0, max_inflight=2, max_queue=2, concurrency={"ingest": 1},
+                                     lag=lambda: 0.0)
+    await controller.acquire(None, "ingest")
+    # A second ingest waits for the first even though a global slot is free
+    queued_ingest = asyncio.create_task(controller.acquire(None, "ingest"))
+    await asyncio.sleep(0)
+    await controller.acquire(None, "list")
+    queued_list = asyncio.create_task(controller.acquire(None, "list"))
+    await asyncio.sleep(0)
+    assert controller.queued == 2
+    with pytest.raises(ServerBusy) as excinfo:
+        await controller.acquire(None, "list")
+    assert excinfo.value.reason == "queue_full"
+    controller.release("ingest")
+    await queued_ingest
+    assert not queued_list.done()
+    controller.release("list")
+    await queued_list
+    assert controller.inflight == 2 and controller.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_and_cancellation_release_their_place():
+    controller = AdmissionController(rate=0, max_inflight=1, queue_timeout=0.05, lag=lambda: 0.0)
+    await controller.acquire(None, "t")
+    with pytest.raises(ServerBusy) as excinfo:
+        await controller.acquire(None, "t")
+    assert excinfo.value.reason == "queue_timeout"
+    waiter = asyncio.create_task(controller.acquire(None, "t"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert controller.queued == 0
+    controller.release("t")
+    assert controller.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_lagging_loop_sheds_calls_with_server_busy(monkeypatch):
+    controller = AdmissionController(rate=0, max_lag=0.5, lag=lambda: 2.0)
+    monkeypatch.setattr(handlers, "admission_controller", controller)
+    with pytest.raises(ToolError) as excinfo:
+        await call_tool("get_api_schema", {}, ToolContext(None))
+    assert excinfo.value.code == handlers.SERVER_BUSY
+    assert excinfo.value.status == 429
+    assert excinfo.value.to_dict()["data"] == {"reason": "overloaded", "retry_after": 1.0}
+    assert controller.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_closed_sessions_drop_their_bucket(monkeypatch):
+    controller = AdmissionController(lag=lambda: 0.0)
+    monkeypatch.setattr(handlers, "admission_controller", controller)
+    monkeypatch.setattr(session_module, "admission_controller", controller)
+
+    async def send(data):
+        pass
+
+    session = Session(send, None)
+    await call_tool("get_api_schema", {}, ToolContext(None, session=session))
+    assert list(controller._buckets) == [id(session)]
+    await session.close()
+    assert controller.stats()["clients"] == 0
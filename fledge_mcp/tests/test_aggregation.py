@@ -0,0 +1,74 @@
+"""Tests for server-side aggregation of sensor readings."""
+
+import numpy as np
+import pytest
+
+from fledge_mcp import aggregation
+from fledge_mcp.timeseries import format_timestamp
+
+
+def readings(values, start=1_700_000_000):
+    """Fledge-style readings, newest first, one second apart."""
+    return [
+        {"reading": {"value": v, "label": "x"}, "timestamp": format_timestamp(start + i)}
+        for i, v in enumerate(values)
+    ][::-1]
+
+
+def test_buckets_min_max_mean_count():
+    result = aggregation.aggregate(readings([1, 3, 5, 7, 9, 11]), {"buckets": 3})
+    assert result["count"] == 6
+    stats = result["buckets"]["datapoints"]["value"]
+    assert stats["count"] == [2, 2, 2]
+    assert stats["min"] == [1.0, 5.0, 9.0]
+    assert stats["max"] == [3.0, 7.0, 11.0]
+    assert stats["mean"] == [2.0, 6.0, 10.0]
+    # non-numeric datapoints are skipped
+    assert "label" not in result["buckets"]["datapoints"]
+
+
+def test_empty_buckets_are_null():
+    data = readings([1, 2]) + readings([10], start=1_700_000_010)
+    stats = aggregation.aggregate(data, {"buckets": 5})["buckets"]["datapoints"]["value"]
+    assert stats["count"][0] == 2 and stats["count"][-1] == 1
+    assert stats["mean"][2] is None
+
+
+def test_percentiles():
+    result = aggregation.aggregate(readings(list(range(101))), {"percentiles": [50, 99.5]})
+    assert result["percentiles"]["value"] == {"p50": 50.0, "p99.5": 99.5}
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[500] = 100.0
+    keep = aggregation.lttb(x, y, 20)
+    assert len(keep) == 20
+    assert keep[0] == 0 and keep[-1] == 999
+    assert 500 in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_downsample_output_and_validation():
+    result = aggregation.aggregate(readings(list(range(50))), {"downsample": 10})
+    assert len(result["downsampled"]["value"]["values"]) == 10
+    with pytest.raises(ValueError):
+        aggregation.validate({"buckets": 0})
+    with pytest.raises(ValueError):
+        aggregation.validate({"percentiles": [101]})
+    assert not aggregation.requested({"limit": 10})
+
+
+def test_mixed_and_numeric_timestamps():
+    base = 1_700_000_000
+    data = [
+        {"reading": {"value": 1}, "timestamp": format_timestamp(base)},
+        {"reading": {"value": 2}, "timestamp": "2023-11-14T22:13:21+00:00"},
+        {"reading": {"value": 3}, "timestamp": base + 2},
+    ]
+    result = aggregation.aggregate(data, {"buckets": 3})
+    assert result["start"] == format_timestamp(base) and result["end"] == format_timestamp(base + 2)
+    assert result["buckets"]["datapoints"]["value"]["count"] == [1, 1, 1]
+    with pytest.raises(ValueError, match="invalid timestamp"):
+        aggregation.aggregate(data + [{"reading": {"value": 4}, "timestamp": "yesterday"}], {"buckets": 3})
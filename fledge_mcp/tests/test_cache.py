@@ -0,0 +1,82 @@
+"""Tests for the read-through tool cache."""
+
+import asyncio
+
+import pytest
+
+from fledge_mcp.cache import ToolCache, parse_ttls
+from fledge_mcp.fledge_client import FledgeAPIError
+
+
+def test_ttl_expiry_and_key_normalisation(clock):
+    cache = ToolCache({"get_sensor_data": 1.0}, max_entries=10, clock=clock)
+    cache.set("get_sensor_data", {"sensor_id": "a", "limit": 5, "time_range": None}, [1])
+    assert cache.get("get_sensor_data", {"limit": 5, "sensor_id": "a"}) == (True, [1])
+    clock.now = 2.0
+    assert cache.get("get_sensor_data", {"limit": 5, "sensor_id": "a"}) == (False, None)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = ToolCache({"get_sensor_data": 10.0}, max_entries=2)
+    for sensor in ("a", "b"):
+        cache.set("get_sensor_data", {"sensor_id": sensor}, sensor)
+    cache.get("get_sensor_data", {"sensor_id": "a"})
+    cache.set("get_sensor_data", {"sensor_id": "c"}, "c")
+    assert cache.get("get_sensor_data", {"sensor_id": "b"}) == (False, None)
+    assert cache.get("get_sensor_data", {"sensor_id": "a"}) == (True, "a")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_write_tools_invalidate_affected_entries():
+    cache = ToolCache({"get_sensor_data": 10.0, "list_sensors": 10.0, "list_plugins": 10.0})
+    cache.set("get_sensor_data", {"sensor_id": "a"}, "a")
+    cache.set("get_sensor_data", {"sensor_id": "b"}, "b")
+    cache.set("list_sensors", {}, ["a", "b"])
+    cache.set("list_plugins", {}, [])
+    cache.invalidate("ingest_test_data", {"sensor_id": "a", "value": 1})
+    assert cache.get("get_sensor_data", {"sensor_id": "a"})[0] is False
+    assert cache.get("get_sensor_data", {"sensor_id": "b"})[0] is True
+    assert cache.get("list_sensors", {})[0] is False
+    assert cache.get("list_plugins", {})[0] is True
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_skips_uncacheable_tools():
+    cache = ToolCache(parse_ttls("list_sensors=5,list_plugins=0"))
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert await cache.get_or_fetch("list_sensors", {}, fetch) == 1
+    assert await cache.get_or_fetch("list_sensors", {}, fetch) == 1
+    assert await cache.get_or_fetch("list_plugins", {}, fetch) == 2
+    assert await cache.get_or_fetch("list_plugins", {}, fetch) == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_a_fetch_and_failed_fetches_are_not_cached():
+    cache = ToolCache({"list_sensors": 10.0})
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_fetch():
+        started.set()
+        await release.wait()
+        return ["stale"]
+
+    pending = asyncio.ensure_future(cache.get_or_fetch("list_sensors", {}, slow_fetch))
+    await started.wait()
+    cache.invalidate("ingest_test_data", {"sensor_id": "a", "value": 1})
+    release.set()
+    assert await pending == ["stale"]
+    assert cache.get("list_sensors", {}) == (False, None)
+
+    async def failing_fetch():
+        raise FledgeAPIError(503, "unavailable")
+
+    with pytest.raises(FledgeAPIError):
+        await cache.get_or_fetch("list_sensors", {}, failing_fetch)
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,38 @@
+"""Tests for the pluggable JSON codec."""
+
+import sys
+import importlib
+
+import numpy as np
+import pytest
+
+from fledge_mcp import codec
+
+
+def test_round_trip_returns_bytes():
+    message = {"jsonrpc": "2.0", "result": [{"value": 1.5, "name": "é"}], "id": 1}
+    encoded = codec.dumps(message)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == message
+    assert codec.loads(codec.dumps_text(message)) == message
+
+
+def test_numpy_values_and_big_integers_encode():
+    assert codec.loads(codec.dumps({"x": np.float64(2.5)})) == {"x": 2.5}
+    assert codec.loads(codec.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_parse_errors_are_json_decode_errors():
+    with pytest.raises(codec.JSONDecodeError):
+        codec.loads(b"{broken")
+
+
+def test_stdlib_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    fallback = importlib.reload(codec)
+    try:
+        assert fallback.BACKEND == "json"
+        assert fallback.loads(fallback.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+    finally:
+        monkeypatch.undo()
+        importlib.reload(codec)
@@ -0,0 +1,76 @@
+"""Tests for size-aware WebSocket and HTTP response compression."""
+
+import gzip
+import zlib
+
+import aiohttp
+import pytest
+import websockets
+from aiohttp import web
+
+from fledge_mcp import codec, compression, metrics
+
+READINGS = [{"reading": {"value": 21.5}, "timestamp": f"2026-01-01 00:00:{i % 60:02d}.000000"} for i in range(500)]
+
+
+def test_choose_encoding():
+    assert compression.choose_encoding("gzip, deflate, br") == "gzip"
+    assert compression.choose_encoding("deflate") == "deflate"
+    assert compression.choose_encoding("gzip;q=0, deflate;q=0.5") == "deflate"
+    assert compression.choose_encoding("*") == "gzip"
+    assert compression.choose_encoding("identity") is None
+    assert compression.choose_encoding("") is None
+
+
+@pytest.mark.asyncio
+async def test_http_bodies_above_threshold_are_compressed(serve):
+    async def large(request):
+        return codec.json_response(READINGS)
+
+    async def small(request):
+        return codec.json_response({"status": "ok"})
+
+    app = web.Application(middlewares=[compression.http_middleware(min_size=1024)])
+    app.router.add_get("/large", large)
+    app.router.add_get("/small", small)
+    _, base = await serve(app)
+    before = metrics.compression_input_bytes.value(transport="http")
+    async with aiohttp.ClientSession(auto_decompress=False) as session:
+        async with session.get(f"{base}/large", headers={"Accept-Encoding": "gzip"}) as response:
+            body = await response.read()
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert codec.loads(gzip.decompress(body)) == READINGS
+            assert int(response.headers["Content-Length"]) == len(body) < len(codec.dumps(READINGS)) / 5
+        async with session.get(f"{base}/large", headers={"Accept-Encoding": "deflate"}) as response:
+            assert codec.loads(zlib.decompress(await response.read())) == READINGS
+        async with session.get(f"{base}/large", headers={"Accept-Encoding": "identity"}) as response:
+            assert "Content-Encoding" not in response.headers
+        async with session.get(f"{base}/small", headers={"Accept-Encoding": "gzip"}) as response:
+            assert "Content-Encoding" not in response.headers
+            assert codec.loads(await response.read()) == {"status": "ok"}
+    assert metrics.compression_input_bytes.value(transport="http") == before + 2 * len(codec.dumps(READINGS))
+
+
+@pytest.mark.asyncio
+async def test_small_websocket_messages_skip_deflate():
+    async def handler(websocket, path):
+        async for message in websocket:
+            await websocket.send(codec.dumps_text(READINGS) if message == "large" else "ok")
+
+    server = await websockets.serve(handler, "127.0.0.1", 0, **compression.websocket_options(min_size=1024))
+    port = server.sockets[0].getsockname()[1]
+    skipped = metrics.compression_skipped.value(transport="websocket")
+    compressed = metrics.compression_output_bytes.value(transport="websocket")
+    try:
+        async with websockets.connect(f"ws://127.0.0.1:{port}") as client:
+            assert client.extensions and client.extensions[0].name == "permessage-deflate"
+            await client.send("small")
+            assert await client.recv() == "ok"
+            await client.send("large")
+            assert codec.loads(await client.recv()) == READINGS
+    finally:
+        server.close()
+        await server.wait_closed()
+    assert metrics.compression_skipped.value(transport="websocket") == skipped + 1
+    assert 0 < metrics.compression_output_bytes.value(transport="websocket") - compressed < len(codec.dumps(READINGS)) / 5
+    assert "permessage-deflate" not in str(compression.websocket_options("none"))
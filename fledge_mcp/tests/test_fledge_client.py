@@ -0,0 +1,188 @@
+"""Tests for the asynchronous Fledge API client."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from fledge_mcp.fledge_client import FledgeAPIError, FledgeClient, UpstreamUnavailable
+from fledge_mcp.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def upstream(routes):
+    """A throwaway upstream Fledge API serving routes."""
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_get_and_post_round_trip(serve):
+    received = []
+
+    async def asset(request):
+        return web.json_response([{"reading": {"value": 1}, "limit": request.query["limit"]}])
+
+    async def ingest(request):
+        received.append(await request.json())
+        return web.json_response({"result": "success"})
+
+    _, base_url = await serve(upstream([
+        web.get("/fledge/asset/{sensor_id}", asset),
+        web.post("/fledge/south/ingest", ingest),
+    ]), "/fledge")
+    client = FledgeClient(base_url, pool_size=2)
+    try:
+        readings = await client.get("/asset/temp", params={"limit": 5})
+        assert readings == [{"reading": {"value": 1}, "limit": "5"}]
+        await client.post("/south/ingest", json={"asset": "temp"})
+        assert received == [{"asset": "temp"}]
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_upstream_does_not_block_loop(serve):
+    async def slow(request):
+        await asyncio.sleep(0.5)
+        return web.json_response({"version": "2.0"})
+
+    _, base_url = await serve(upstream([web.get("/fledge/ping", slow)]), "/fledge")
+    client = FledgeClient(base_url)
+    try:
+        pending = asyncio.create_task(client.get("/ping"))
+        ticks = 0
+        while not pending.done():
+            await asyncio.sleep(0.05)
+            ticks += 1
+        assert pending.result() == {"version": "2.0"}
+        assert ticks >= 5
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_per_call_timeout(serve):
+    async def hang(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    _, base_url = await serve(upstream([web.get("/fledge/ping", hang)]), "/fledge")
+    client = FledgeClient(base_url, retries=0)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get("/ping", timeout=0.2)
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_identical_gets_are_coalesced(serve):
+    hits = []
+
+    async def assets(request):
+        hits.append(1)
+        await asyncio.sleep(0.1)
+        return web.json_response([{"assetCode": "temp"}])
+
+    _, base_url = await serve(upstream([web.get("/fledge/asset", assets)]), "/fledge")
+    client = FledgeClient(base_url)
+    try:
+        results = await asyncio.gather(*(client.get("/asset") for _ in range(10)))
+        assert results == [[{"assetCode": "temp"}]] * 10
+        assert len(hits) == 1
+        assert client.coalesced == 9
+        await client.get("/asset")
+        assert len(hits) == 2
+        # Calls with their own timeout or retries are not shared with default ones
+        await asyncio.gather(client.get("/asset"), client.get("/asset", timeout=5), client.get("/asset", retries=0))
+        assert len(hits) == 5
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_gets_are_retried_after_server_errors(serve):
+    hits = []
+
+    async def flaky(request):
+        hits.append(1)
+        if len(hits) < 3:
+            return web.json_response({"message": "busy"}, status=503)
+        return web.json_response({"version": "2.0"})
+
+    _, base_url = await serve(upstream([web.get("/fledge/ping", flaky), web.post("/fledge/ping", flaky)]), "/fledge")
+    client = FledgeClient(base_url, retries=2, retry_backoff=0.01)
+    try:
+        assert await client.get("/ping", raise_for_status=True) == {"version": "2.0"}
+        assert len(hits) == 3
+        assert client.breaker.failures == 0
+        hits.clear()
+        # Writes are never retried
+        with pytest.raises(FledgeAPIError):
+            await client.post("/ping", raise_for_status=True)
+        assert len(hits) == 1
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_html_error_pages_are_retried_and_count_against_the_breaker(serve):
+    hits = []
+
+    async def proxy(request):
+        hits.append(1)
+        if len(hits) < 3:
+            return web.Response(status=502, text="<html>Bad Gateway</html>", content_type="text/html")
+        return web.json_response({"version": "2.0"})
+
+    _, base_url = await serve(upstream([web.get("/fledge/ping", proxy)]), "/fledge")
+    breaker = CircuitBreaker(failure_threshold=5)
+    client = FledgeClient(base_url, retries=1, retry_backoff=0.01, breaker=breaker)
+    try:
+        with pytest.raises(FledgeAPIError) as excinfo:
+            await client.get("/ping")
+        assert excinfo.value.status == 502 and "Bad Gateway" in str(excinfo.value)
+        assert len(hits) == 2 and breaker.failures == 2
+        assert await client.get("/ping") == {"version": "2.0"}
+        assert breaker.failures == 0
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_breaker_fails_fast_and_recovers(serve, clock):
+    async def ping(request):
+        return web.json_response({})
+
+    runner, base_url = await serve(upstream([web.get("/fledge/ping", ping)]), "/fledge")
+    await runner.cleanup()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    client = FledgeClient(base_url, retries=0, breaker=breaker)
+    try:
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await client.get("/ping")
+        assert breaker.state == OPEN
+        with pytest.raises(UpstreamUnavailable):
+            await client.get("/ping")
+        assert breaker.rejected == 1
+        clock.now += 10
+        assert breaker.state == HALF_OPEN
+        _, base_url = await serve(upstream([web.get("/fledge/ping", ping)]), "/fledge")
+        client.base_url = base_url
+        assert await client.get("/ping") == {}
+        assert breaker.status()["state"] == CLOSED and breaker.trips == 1
+    finally:
+        await client.close()
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now += 5
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.retry_after() == 5
@@ -0,0 +1,136 @@
+"""Tests for table-driven tool dispatch and schema validation."""
+
+import pytest
+
+from fledge_mcp import codec, handlers, smithery_server
+from fledge_mcp.fledge_client import FledgeClient
+from fledge_mcp.handlers import ToolContext, ToolError, call_tool
+from fledge_mcp.registry import DEFAULT_TOOLS_FILE, get_registry
+from fledge_mcp.resilience import CircuitBreaker
+from fledge_mcp.smithery_server import handle_tool_call
+from fledge_mcp.validation import ValidationError, compile_validator
+
+
+class StubClient:
+    """Fledge client stand-in that records requests."""
+
+    base_url = "http://fledge.test/fledge"
+
+    def __init__(self, response=None):
+        self.response = response
+        self.calls = []
+
+    async def get(self, path, params=None, raise_for_status=False):
+        self.calls.append(("GET", path, params))
+        return self.response
+
+    async def put(self, path, json=None, raise_for_status=False):
+        self.calls.append(("PUT", path, json))
+        return self.response
+
+
+def test_validator_checks_types_required_fields_and_limits():
+    validate = compile_validator({
+        "sensor_id": {"type": "string"},
+        "limit": {"type": "integer", "optional": True, "minimum": 1},
+        "method": {"type": "string", "optional": True, "enum": ["GET", "POST"]},
+    })
+    assert validate({"sensor_id": "temp", "limit": 5}) == {"sensor_id": "temp", "limit": 5}
+    for params, message in [
+        ({}, "sensor_id required"),
+        ({"sensor_id": 3}, "sensor_id must be of type string"),
+        ({"sensor_id": "temp", "limit": True}, "limit must be of type integer"),
+        ({"sensor_id": "temp", "limit": 0}, "limit must be >= 1"),
+        ({"sensor_id": "temp", "method": "PATCH"}, "method must be one of GET, POST"),
+    ]:
+        with pytest.raises(ValidationError, match=message):
+            validate(params)
+
+
+def test_every_catalog_tool_has_a_handler():
+    for path in (DEFAULT_TOOLS_FILE, DEFAULT_TOOLS_FILE.replace("smithery.json", "tools.json")):
+        registry = get_registry(path)
+        assert set(registry.by_name) == set(handlers.HANDLERS)
+        assert set(registry.validators) == set(registry.by_name)
+
+
+@pytest.mark.asyncio
+async def test_invalid_params_are_rejected_before_the_handler_runs():
+    client = StubClient()
+    with pytest.raises(ToolError) as excinfo:
+        await call_tool("get_sensor_data", {"limit": 10}, ToolContext(client))
+    assert excinfo.value.code == handlers.INVALID_PARAMS
+    assert excinfo.value.status == 400
+    assert client.calls == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_and_handler_failures():
+    with pytest.raises(ToolError) as excinfo:
+        await call_tool("no_such_tool", {}, ToolContext(StubClient()))
+    assert excinfo.value.status == 404
+    with pytest.raises(ToolError) as excinfo:
+        await call_tool("update_config", {"config_key": "k", "value": "v"}, ToolContext(None))
+    assert excinfo.value.code == handlers.SERVER_ERROR
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_with_upstream_unavailable():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    client = FledgeClient("http://127.0.0.1:1/fledge", breaker=breaker)
+    try:
+        with pytest.raises(ToolError) as excinfo:
+            await call_tool("get_sensor_data", {"sensor_id": "breaker_test"}, ToolContext(client))
+        assert excinfo.value.code == handlers.UPSTREAM_UNAVAILABLE
+        assert excinfo.value.status == 503
+        with pytest.raises(ToolError) as excinfo:
+            await call_tool("validate_api_connection", {}, ToolContext(client))
+        assert "circuit open" in str(excinfo.value)
+        assert breaker.rejected == 2
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_jsonrpc_results_are_wrapped(monkeypatch):
+    monkeypatch.setattr("fledge_mcp.smithery_server.get_client", lambda: StubClient())
+    # List results used to break the JSON-RPC envelope merge
+    response = await handle_tool_call({"name": "generate_mock_data", "parameters": {"count": 2}})
+    assert len(response["result"]) == 2
+    response = await handle_tool_call({"name": "fetch_sample_frontend", "parameters": {}})
+    assert "code" in response["result"]
+    response = await handle_tool_call({"name": "subscribe_to_sensor", "parameters": {"sensor_id": "temp"}})
+    assert response["error"]["code"] == handlers.INVALID_PARAMS
+
+
+@pytest.mark.asyncio
+async def test_http_response_maps_results_and_errors():
+    context = ToolContext(StubClient({"status": "ok"}))
+    response = await handlers.http_response({"name": "update_config", "parameters": {"config_key": "k", "value": "v"}}, context)
+    assert response.status == 200
+    assert codec.loads(response.body) == {"status": "ok"}
+    assert context.client.calls == [("PUT", "/category/core", {"k": "v"})]
+    response = await handlers.http_response({"name": "start_stop_service", "parameters": {"service_type": "south", "action": "restart"}}, context)
+    assert response.status == 400
+    assert codec.loads(response.body) == {"error": "action must be one of start, stop"}
+
+
+@pytest.mark.asyncio
+async def test_smithery_batches_skip_notifications():
+    batch = [
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "method": "tools/list", "id": 1},
+    ]
+    responses = await smithery_server.handle_batch(batch)
+    assert [response["id"] for response in responses] == [1]
+    assert await smithery_server.handle_batch(batch[:1]) is None
+
+
+@pytest.mark.asyncio
+async def test_unparseable_timestamps_are_invalid_params():
+    context = ToolContext(StubClient([{"reading": {"value": 1}, "timestamp": "yesterday"}]))
+    params = {"sensor_id": "bad-stamps", "time_range": "1h", "buckets": 2}
+    with pytest.raises(ToolError) as excinfo:
+        await call_tool("get_sensor_data", params, context)
+    assert excinfo.value.code == handlers.INVALID_PARAMS
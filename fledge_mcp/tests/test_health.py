@@ -0,0 +1,45 @@
+"""Tests for the async health, readiness and metrics endpoints."""
+
+import aiohttp
+import pytest
+
+from fledge_mcp import health, mock_fledge
+from fledge_mcp.fledge_client import FledgeClient
+from fledge_mcp.health import UpstreamProbe
+from fledge_mcp.mock_fledge import MockFledge
+
+
+@pytest.mark.asyncio
+async def test_probe_caches_ping_result_and_expires(clock):
+    runner, base_url = await mock_fledge.start(MockFledge(assets=0, readings=0))
+    client = FledgeClient(base_url, coalesce=False)
+    try:
+        probe = UpstreamProbe(client, interval=5, timeout=1, clock=clock)
+        assert not probe.ready
+        assert await probe.check()
+        assert probe.ready and probe.version == mock_fledge.VERSION
+        clock.now += probe.max_age + 1
+        assert not probe.ready
+    finally:
+        await client.close()
+        await runner.cleanup()
+    assert not await probe.check()
+    assert probe.status()["error"]
+
+
+@pytest.mark.asyncio
+async def test_endpoints(serve):
+    probe = UpstreamProbe(client=None)
+    _, base = await serve(health.create_app(probe))
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base}/ready") as response:
+            assert response.status == 503
+        probe.ok, probe.checked_at = True, probe.clock()
+        async with session.get(f"{base}/ready") as response:
+            assert response.status == 200
+        async with session.get(f"{base}/health") as response:
+            body = await response.json()
+            assert body["status"] == "ok" and body["upstream"]["ready"] and "cache" in body
+        async with session.get(f"{base}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "fledge_mcp_tool_calls_total" in await response.text()
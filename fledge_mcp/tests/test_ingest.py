@@ -0,0 +1,69 @@
+"""Tests for bulk ingestion."""
+
+import time
+import asyncio
+
+import pytest
+
+from fledge_mcp import ingest
+from fledge_mcp.fledge_client import FledgeAPIError
+from fledge_mcp.timeseries import parse_timestamp
+
+
+class StubClient:
+    """Records ingest posts and fails any batch containing a reading for asset 'bad'."""
+
+    def __init__(self):
+        self.posts = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def post(self, path, json=None, raise_for_status=False):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        batch = json if isinstance(json, list) else [json]
+        if any(reading["asset"] == "bad" for reading in batch):
+            raise FledgeAPIError(500, "boom")
+        self.posts.append(json)
+
+
+def test_legacy_parameters_require_sensor_and_value():
+    with pytest.raises(ValueError):
+        ingest.readings_from_params({"sensor_id": "temp"})
+    assert len(list(ingest.readings_from_params({"sensor_id": "temp", "value": 1, "count": 3}))) == 3
+
+
+def test_generator_spec_is_lazy_and_seeded():
+    spec = {"assets": ["a", "b"], "count": 3, "min": 1, "max": 2, "seed": 7, "start": "2024-01-01T00:00:00"}
+    readings = list(ingest.readings_from_params({"generator": spec}))
+    assert len(readings) == 6
+    assert readings[0]["timestamp"] == "2024-01-01 00:00:00"
+    assert all(1 <= r["readings"]["value"] <= 2 for r in readings)
+    assert readings == list(ingest.readings_from_params({"generator": spec}))
+
+
+def test_generator_rejects_wrong_types_and_uses_utc():
+    for spec in ({"count": "many"}, {"min": None}, {"asset_count": [2]}, {"start": 20240101}):
+        with pytest.raises(ValueError):
+            ingest.readings_from_params({"generator": spec})
+    spec = {"assets": ["a"], "count": 1, "start": "2024-01-01T02:00:00+02:00"}
+    assert next(ingest.readings_from_params({"generator": spec}))["timestamp"] == "2024-01-01 00:00:00"
+    reading = next(ingest.readings_from_params({"generator": {"assets": ["a"], "count": 1, "interval": 0}}))
+    assert abs(parse_timestamp(reading["timestamp"]) - time.time()) < 5
+
+
+@pytest.mark.asyncio
+async def test_batched_ingest_reports_failures():
+    client = StubClient()
+    readings = [{"asset": "ok", "readings": {"value": i}} for i in range(10)]
+    readings[4]["asset"] = "bad"
+    payloads = ingest.readings_from_params({"readings": readings})
+    report = await ingest.ingest(client, payloads, batch_size=3, concurrency=2)
+    assert report["batches"] == 4
+    assert report["ingested"] == 7
+    assert report["failed"] == 3
+    assert report["failures"][0]["batch"] == 1
+    assert all(isinstance(post, list) for post in client.posts)
+    assert client.peak <= 2
@@ -0,0 +1,49 @@
+"""Tests for queued, structured and sampled logging."""
+
+import io
+import json
+import logging
+
+from fledge_mcp import logs
+
+
+def test_truncated_params_are_bounded_and_lazy():
+    params = {"endpoint": "/asset", "payload": {"code": "x" * 100000}, "items": list(range(10000))}
+    text = str(logs.Truncated(params, limit=120))
+    assert len(text) <= 123 and text.endswith("...")
+    assert "'endpoint': '/asset'" in text
+    assert str(logs.Truncated({"a": 1})) == "{'a': 1}"
+
+
+def test_sampling():
+    assert logs.sampled(1)
+    assert not any(logs.sampled(0) for _ in range(100))
+
+
+def test_json_lines_are_written_by_the_listener_thread():
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    stream = io.StringIO()
+    try:
+        logs.configure(logging.INFO, "json", stream=stream)
+        logger = logging.getLogger("FledgeLogTest")
+        logger.debug("hidden")
+        logger.info("Received tool call: %s with params: %s", "list_sensors", logs.Truncated({"k": "v\n"}),
+                    extra={"tool": "list_sensors"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+        logs.shutdown()
+    finally:
+        logs.shutdown()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["message"] == "Received tool call: list_sensors with params: {'k': 'v\\n'}"
+    assert lines[0]["tool"] == "list_sensors" and lines[0]["level"] == "INFO" and lines[0]["logger"] == "FledgeLogTest"
+    assert "ValueError: boom" in lines[1]["exception"]
@@ -0,0 +1,40 @@
+"""Tests for JSON-RPC message handling in the main entry point."""
+
+import pytest
+
+from fledge_mcp import main
+from fledge_mcp.main import handle_message
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_array_of_responses():
+    batch = [
+        {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "get_api_schema"}, "id": 1},
+        {"jsonrpc": "2.0", "method": "unknown", "id": 2},
+        "not a request",
+    ]
+    responses = await handle_message(batch)
+    assert isinstance(responses, list)
+    assert responses[0] == {"jsonrpc": "2.0", "result": {"endpoints": ["/asset", "/service", "/south/ingest"]}, "id": 1}
+    assert responses[1]["error"]["code"] == -32601
+    assert responses[2]["error"]["code"] == -32600
+
+
+@pytest.mark.asyncio
+async def test_empty_batch_is_invalid():
+    response = await handle_message([])
+    assert response["error"]["code"] == -32600
+
+
+def test_workers_serve_metrics_on_their_own_port(monkeypatch):
+    ports = []
+
+    async def fake_main(port, fledge_api, tools_file, api_key, http_port, max_concurrency, reuse_port=False):
+        ports.append((port, http_port, reuse_port))
+
+    monkeypatch.setattr(main, "main", fake_main)
+    monkeypatch.setattr(main.logs, "configure", lambda *args: None)
+    for worker_id in ("0", "2"):
+        monkeypatch.setenv("WORKER_ID", worker_id)
+        main.run_worker(3000, "http://fledge", "tools.json", None, 8083, 4, 20, "text")
+    assert ports == [(3000, 8083, True), (3000, 8085, True)]
@@ -0,0 +1,59 @@
+"""Tests for the Prometheus metrics registry and instrumentation."""
+
+import pytest
+
+from fledge_mcp import metrics, mock_fledge
+from fledge_mcp.fledge_client import FledgeClient
+from fledge_mcp.handlers import ToolContext, call_tool
+from fledge_mcp.metrics import MetricsRegistry
+from fledge_mcp.mock_fledge import MockFledge
+
+
+def test_text_format():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ("tool",))
+    idle = registry.gauge("idle", "Idle gauge")
+    latency = registry.histogram("latency_seconds", "Latency", ("tool",), buckets=(0.1, 1.0))
+    registry.gauge("ratio", "Computed", function=lambda: 0.5)
+    calls.inc(tool='say "hi"')
+    calls.inc(2, tool='say "hi"')
+    for value in (0.05, 0.5, 0.5, 3):
+        latency.observe(value, tool="t")
+    text = registry.render()
+    assert '# TYPE calls_total counter\ncalls_total{tool="say \\"hi\\""} 3\n' in text
+    assert "idle 0\n" in text
+    assert 'latency_seconds_bucket{tool="t",le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{tool="t",le="1.0"} 3\n' in text
+    assert 'latency_seconds_bucket{tool="t",le="+Inf"} 4\n' in text
+    assert 'latency_seconds_count{tool="t"} 4\n' in text
+    assert 'latency_seconds_sum{tool="t"} 4.05\n' in text
+    assert "ratio 0.5\n" in text
+    with pytest.raises(ValueError):
+        calls.inc(other="x")
+
+
+def test_path_label_collapses_identifiers():
+    assert metrics.path_label("/asset/sensor_1") == "/asset/{id}"
+    assert metrics.path_label("/asset") == "/asset"
+    assert metrics.path_label("/category/core?x=1") == "/category/{id}"
+    assert metrics.path_label("/asset/sensor_1/summary") == "other"
+    assert metrics.path_label("/anything/a-client/chose") == "other"
+
+
+@pytest.mark.asyncio
+async def test_tool_and_upstream_calls_are_recorded():
+    runner, base_url = await mock_fledge.start(MockFledge(assets=1, readings=3))
+    client = FledgeClient(base_url, coalesce=False)
+    before = metrics.tool_calls.value(tool="list_sensors", status="ok")
+    upstream_before = metrics.upstream_responses.value(method="GET", path="/asset/{id}", status=200)
+    try:
+        # An unused parameter keeps the call out of results cached by other tests
+        await call_tool("list_sensors", {"fresh": 1}, ToolContext(client))
+        await client.get("/asset/sensor_0", params={"limit": 1})
+    finally:
+        await client.close()
+        await runner.cleanup()
+    assert metrics.tool_calls.value(tool="list_sensors", status="ok") == before + 1
+    assert metrics.upstream_responses.value(method="GET", path="/asset/{id}", status=200) == upstream_before + 1
+    assert metrics.requests_in_flight.value() == 0
+    assert "fledge_mcp_cache_hit_ratio" in metrics.registry.render()
@@ -0,0 +1,59 @@
+"""Tests for the mock Fledge REST API."""
+
+import pytest
+
+from fledge_mcp import ingest, mock_fledge
+from fledge_mcp.fledge_client import FledgeAPIError, FledgeClient
+from fledge_mcp.handlers import ToolContext, call_tool
+from fledge_mcp.mock_fledge import MockFledge
+
+
+@pytest.mark.asyncio
+async def test_assets_page_newest_first():
+    runner, base_url = await mock_fledge.start(MockFledge(assets=3, readings=50, seed=1))
+    client = FledgeClient(base_url, coalesce=False)
+    try:
+        assert await client.get("/asset") == [{"assetCode": f"sensor_{i}", "count": 50} for i in range(3)]
+        first = await client.get("/asset/sensor_0", params={"limit": 10})
+        second = await client.get("/asset/sensor_0", params={"limit": 10, "skip": 10})
+        stamps = [r["timestamp"] for r in first + second]
+        assert stamps == sorted(stamps, reverse=True) and len(set(stamps)) == 20
+        assert len(await client.get("/asset/sensor_0", params={"limit": 100, "skip": 45})) == 5
+        assert await client.get("/asset/missing") == []
+        assert (await client.get("/ping"))["version"] == mock_fledge.VERSION
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_ingested_readings_are_served_first():
+    mock = MockFledge(assets=1, readings=5)
+    runner, base_url = await mock_fledge.start(mock)
+    client = FledgeClient(base_url, coalesce=False)
+    try:
+        readings = ingest.readings_from_params({"sensor_id": "sensor_0", "value": 42, "count": 3})
+        report = await ingest.ingest(client, readings, batch_size=2)
+        assert report["ingested"] == 3 and mock.stats["ingested"] == 3
+        latest = await client.get("/asset/sensor_0", params={"limit": 4})
+        assert [r["reading"]["value"] for r in latest[:3]] == [42, 42, 42]
+        assert await call_tool("get_service_status", {}, ToolContext(client)) == {"services": mock_fledge.SERVICES}
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_and_latency():
+    mock = MockFledge(assets=1, readings=1, error_rate=1.0, latency=0.01)
+    runner, base_url = await mock_fledge.start(mock)
+    client = FledgeClient(base_url, coalesce=False, retries=0)
+    try:
+        with pytest.raises(FledgeAPIError) as excinfo:
+            await client.get("/ping", raise_for_status=True)
+        assert excinfo.value.status == 500
+        assert mock.stats["errors"] == 1
+        assert mock.stats["by_path"] == {"/fledge/ping": 1}
+    finally:
+        await client.close()
+        await runner.cleanup()
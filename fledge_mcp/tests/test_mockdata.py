@@ -0,0 +1,63 @@
+"""Tests for the vectorised mock data generator."""
+
+import numpy as np
+import pytest
+
+from fledge_mcp import mockdata
+from fledge_mcp.handlers import ToolContext, ToolError, call_tool
+
+
+def collect(generator, chunk_size):
+    parts = list(generator.chunks(chunk_size))
+    timestamps = np.concatenate([ts for ts, _ in parts])
+    columns = {name: np.concatenate([cols[name] for _, cols in parts]) for name in generator.sensors}
+    return timestamps, columns
+
+
+@pytest.mark.parametrize("waveform", mockdata.WAVEFORMS)
+def test_seeded_output_does_not_depend_on_chunk_size(waveform):
+    params = {"sensors": ["a", "b"], "count": 1000, "waveform": waveform, "seed": 42,
+              "noise": 0.5, "anomaly_rate": 0.05, "start": "2024-01-01T00:00:00"}
+    ts_one, one = collect(mockdata.from_params(params), 1000)
+    ts_many, many = collect(mockdata.from_params(params), 37)
+    assert np.array_equal(ts_one, ts_many)
+    for name in ("a", "b"):
+        assert np.allclose(one[name], many[name], rtol=1e-12)
+    assert not np.array_equal(one["a"], one["b"])
+
+
+def test_sample_rate_and_formats():
+    generator = mockdata.from_params({"count": 3, "sample_rate": 10, "start": "2024-01-01T00:00:00+00:00", "seed": 1})
+    columnar = mockdata.render(generator, "columnar")
+    assert columnar["timestamps"] == [1704067200000, 1704067200100, 1704067200200]
+    assert columnar["seed"] == 1
+    rows = mockdata.render(mockdata.from_params({"count": 2, "sensor_id": "temp", "start": "2024-01-01T00:00:00"}))
+    assert [row["timestamp"] for row in rows] == ["2024-01-01T00:00:00.000000", "2024-01-01T00:00:01.000000"]
+    assert rows[0]["asset"] == "temp" and isinstance(rows[0]["readings"]["value"], float)
+    assert mockdata.render(mockdata.from_params({"count": 0}), "columnar")["timestamps"] == []
+
+
+def test_invalid_parameters():
+    for params in ({"waveform": "triangle"}, {"sensors": []}, {"sample_rate": 0}, {"anomaly_rate": 2}, {"start": "soon"}):
+        with pytest.raises(ValueError):
+            mockdata.from_params(params)
+
+
+@pytest.mark.asyncio
+async def test_large_counts_stream_in_chunks(monkeypatch, recorder):
+    monkeypatch.setattr(mockdata, "INLINE_LIMIT", 100)
+    session = recorder
+    params = {"sensors": ["a", "b"], "count": 250, "format": "columnar", "chunk_size": 100}
+    summary = await call_tool("generate_mock_data", params, ToolContext(None, session=session, meta={"progressToken": "t"}))
+    assert summary == {"streamed": True, "progressToken": "t", "count": 500, "pages": 3}
+    assert [params["progress"] for _, params in session.notifications] == [200, 400, 500]
+    assert session.notifications[-1][1]["total"] == 500
+
+
+@pytest.mark.asyncio
+async def test_counts_above_the_maximum_are_rejected(recorder):
+    params = {"count": mockdata.MAX_COUNT + 1}
+    with pytest.raises(ToolError) as excinfo:
+        await call_tool("generate_mock_data", params, ToolContext(None, session=recorder))
+    assert excinfo.value.status == 400
+    assert not recorder.notifications
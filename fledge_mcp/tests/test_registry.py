@@ -0,0 +1,46 @@
+"""Tests for the cached tool registry."""
+
+import os
+import json
+
+from fledge_mcp import codec
+from fledge_mcp.registry import ToolRegistry
+
+
+def write_tools(path, names, mtime):
+    path.write_text(json.dumps({"tools": [{"name": name, "parameters": {}} for name in names]}))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_tools_list_response_is_pre_serialized(tmp_path):
+    tools_file = tmp_path / "tools.json"
+    write_tools(tools_file, ["a", "b"], 1_000_000_000)
+    registry = ToolRegistry(tools_file)
+    response = registry.tools_list_response("7")
+    expected = {"jsonrpc": "2.0", "result": {"tools": [{"name": "a", "parameters": {}}, {"name": "b", "parameters": {}}]}, "id": "7"}
+    assert response == expected
+    assert codec.loads(codec.dumps(response)) == expected
+    assert codec.loads(codec.dumps([response, {"id": 2}])) == [expected, {"id": 2}]
+    assert list(registry.by_name) == ["a", "b"]
+
+
+def test_reload_only_when_mtime_changes(tmp_path):
+    tools_file = tmp_path / "tools.json"
+    write_tools(tools_file, ["a"], 1_000_000_000)
+    registry = ToolRegistry(tools_file, check_interval=0)
+    # Same mtime: content change is not picked up
+    write_tools(tools_file, ["a", "b"], 1_000_000_000)
+    registry.refresh()
+    assert [tool["name"] for tool in registry.tools] == ["a"]
+    write_tools(tools_file, ["a", "b"], 2_000_000_000)
+    registry.refresh()
+    assert [tool["name"] for tool in registry.tools] == ["a", "b"]
+
+
+def test_broken_file_keeps_previous_catalog(tmp_path):
+    tools_file = tmp_path / "tools.json"
+    write_tools(tools_file, ["a"], 1_000_000_000)
+    registry = ToolRegistry(tools_file, check_interval=0)
+    tools_file.write_text("{not json")
+    assert registry.reload() is False
+    assert [tool["name"] for tool in registry.tools] == ["a"]
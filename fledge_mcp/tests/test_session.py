@@ -0,0 +1,78 @@
+"""Tests for concurrent per-connection request dispatch."""
+
+import json
+import asyncio
+
+import pytest
+
+from fledge_mcp import main
+from fledge_mcp.session import Session
+
+
+@pytest.mark.asyncio
+async def test_responses_sent_as_they_complete(socket):
+    async def handler(data, session):
+        await asyncio.sleep(data["params"]["delay"])
+        return {"jsonrpc": "2.0", "result": "ok", "id": data["id"]}
+
+    session = Session(socket.send, handler, max_concurrency=4)
+    await session.dispatch(json.dumps({"method": "slow", "params": {"delay": 0.2}, "id": 1}))
+    await session.dispatch(json.dumps({"method": "fast", "params": {"delay": 0.01}, "id": 2}))
+    await asyncio.sleep(0.3)
+    assert [message["id"] for message in socket.sent] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_applies_backpressure(socket):
+    running = 0
+    peak = 0
+
+    async def handler(data, session):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"jsonrpc": "2.0", "result": None, "id": data["id"]}
+
+    session = Session(socket.send, handler, max_concurrency=2)
+    for i in range(6):
+        await session.dispatch(json.dumps({"method": "x", "id": i}))
+    await asyncio.sleep(0.2)
+    assert peak == 2
+    assert sorted(message["id"] for message in socket.sent) == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_batch_calls_queue_for_their_own_slots(socket, monkeypatch):
+    running = 0
+    peak = 0
+
+    async def handle_request(message, *args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"jsonrpc": "2.0", "result": None, "id": message["id"]}
+
+    monkeypatch.setattr(main, "handle_request", handle_request)
+    session = Session(socket.send, lambda data, session: main.handle_message(data, session=session), max_concurrency=4)
+    await session.dispatch(json.dumps([{"method": "tools/call", "id": i} for i in range(20)]))
+    await session.drain()
+    assert sorted(response["id"] for response in socket.sent[0]) == list(range(20))
+    assert peak == 4
+    assert session._semaphore._value == 4
+
+
+@pytest.mark.asyncio
+async def test_parse_error_and_close(socket):
+    async def handler(data, session):
+        await asyncio.sleep(10)
+
+    session = Session(socket.send, handler)
+    await session.dispatch("{not json")
+    assert socket.sent[0]["error"]["code"] == -32700
+    await session.dispatch(json.dumps({"method": "x", "id": 1}))
+    await session.close()
+    assert len(socket.sent) == 1
@@ -0,0 +1,100 @@
+"""Tests for the newline-delimited JSON-RPC stdio transport."""
+
+import sys
+import json
+import asyncio
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from fledge_mcp import stdio
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class FakeWriter:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    async def drain(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_requests_are_concurrent_and_drained_at_end_of_input():
+    reader = asyncio.StreamReader(limit=1024)
+    writer = FakeWriter()
+
+    async def handler(data, session):
+        await asyncio.sleep(data["params"]["delay"])
+        return {"jsonrpc": "2.0", "result": "ok", "id": data["id"]}
+
+    for msg_id, delay in ((1, 0.2), (2, 0.01)):
+        reader.feed_data(json.dumps({"method": "m", "params": {"delay": delay}, "id": msg_id}).encode() + b"\n")
+    reader.feed_data(b"\n" + b"x" * 2048 + b"\n")
+    reader.feed_eof()
+    await stdio.serve(reader, writer, handler)
+    ids = [line["id"] for line in writer.lines]
+    assert ids[-2:] == [2, 1]
+    assert all(line["error"]["code"] == -32700 for line in writer.lines[:-2])
+
+
+def test_main_serves_stdio_without_listeners():
+    requests = [
+        {"jsonrpc": "2.0", "method": "initialize", "params": {}, "id": 1},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "method": "tools/list", "params": {}, "id": 2},
+        {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "get_api_schema", "parameters": {}}, "id": 3},
+    ]
+    result = subprocess.run(
+        [sys.executable, "-m", "fledge_mcp.main", "--transport", "stdio", "--port", "1", "--http-port", "1"],
+        input="".join(json.dumps(request) + "\n" for request in requests),
+        capture_output=True, text=True, cwd=ROOT, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    responses = {response["id"]: response for response in map(json.loads, result.stdout.splitlines())}
+    assert sorted(responses) == [1, 2, 3]
+    assert responses[1]["result"]["serverInfo"]["name"] == "fledge-mcp"
+    assert len(responses[2]["result"]["tools"]) > 10
+    assert "result" in responses[3]
+    assert "Serving MCP over stdio" in result.stderr
+
+
+@pytest.mark.asyncio
+async def test_tail_of_an_oversized_line_is_discarded():
+    reader = asyncio.StreamReader(limit=1024)
+    writer = FakeWriter()
+
+    async def handler(data, session):
+        return {"jsonrpc": "2.0", "result": "ok", "id": data["id"]}
+
+    async def feed():
+        # The newline ending the long line only arrives after the limit was hit
+        reader.feed_data(b"x" * 2048)
+        await asyncio.sleep(0.01)
+        reader.feed_data(json.dumps({"method": "m", "id": 1}).encode() + b"\n")
+        reader.feed_data(json.dumps({"method": "m", "id": 2}).encode() + b"\n")
+        reader.feed_eof()
+
+    feeder = asyncio.create_task(feed())
+    await stdio.serve(reader, writer, handler)
+    await feeder
+    assert writer.lines[0]["error"]["code"] == -32700
+    assert [line.get("id") for line in writer.lines] == [None, 2]
+
+
+def test_main_writes_to_stdout_redirected_to_a_file(tmp_path):
+    output = tmp_path / "out.log"
+    request = {"jsonrpc": "2.0", "method": "tools/list", "params": {}, "id": 1}
+    with open(output, "wb") as stdout:
+        result = subprocess.run(
+            [sys.executable, "-m", "fledge_mcp.main", "--transport", "stdio", "--port", "1", "--http-port", "1"],
+            input=(json.dumps(request) + "\n").encode(), stdout=stdout, stderr=subprocess.PIPE, cwd=ROOT, timeout=60
+        )
+    assert result.returncode == 0, result.stderr
+    responses = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [response["id"] for response in responses] == [1]
@@ -0,0 +1,99 @@
+"""Tests for paginated streaming of sensor data."""
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from fledge_mcp import handlers, streaming
+from fledge_mcp.fledge_client import FledgeAPIError, UpstreamUnavailable
+from fledge_mcp.handlers import ToolContext
+
+
+class PagedClient:
+    """Serves `total` readings with limit/skip paging."""
+
+    def __init__(self, total):
+        self.total = total
+        self.queries = []
+
+    async def get(self, path, params=None, raise_for_status=False):
+        self.queries.append(dict(params))
+        start = params["skip"]
+        end = min(self.total, start + params["limit"])
+        return [{"reading": {"value": i}, "timestamp": str(i)} for i in range(start, end)]
+
+
+class FailingClient:
+    """Fails every request with the given exception."""
+
+    def __init__(self, error):
+        self.error = error
+
+    async def get(self, path, params=None, raise_for_status=False):
+        raise self.error
+
+
+@pytest.mark.asyncio
+async def test_pages_stop_at_limit_and_end_of_data():
+    client = PagedClient(total=25)
+    pages = [page async for page in streaming.iter_pages(client, "temp", 100, page_size=10)]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    client = PagedClient(total=1000)
+    pages = [page async for page in streaming.iter_pages(client, "temp", 15, page_size=10)]
+    assert [len(page) for page in pages] == [10, 5]
+    assert client.queries[-1] == {"limit": 5, "skip": 10}
+
+
+@pytest.mark.asyncio
+async def test_stream_to_session_sends_progress_notifications(recorder):
+    session = recorder
+    pages = streaming.iter_pages(PagedClient(total=7), "temp", 7, page_size=3)
+    summary = await streaming.stream_to_session(session, pages, progress_token="tok", total=7)
+    assert summary == {"streamed": True, "progressToken": "tok", "count": 7, "pages": 3}
+    assert [params["progress"] for _, params in session.notifications] == [3, 6, 7]
+    assert all(method == streaming.PROGRESS_METHOD for method, _ in session.notifications)
+    assert session.notifications[0][1]["readings"][0]["reading"] == {"value": 0}
+
+
+@pytest.mark.asyncio
+async def test_stream_to_response_writes_json_array(serve):
+    async def handler(request):
+        total = int(request.query["total"])
+        pages = streaming.iter_pages(PagedClient(total=total), "temp", 50, page_size=4)
+        return await streaming.stream_to_response(request, pages)
+
+    app = web.Application()
+    app.router.add_get("/stream", handler)
+    _, base = await serve(app)
+    async with aiohttp.ClientSession() as http:
+        async with http.get(f"{base}/stream?total=10") as response:
+            body = await response.json()
+        assert [r["reading"]["value"] for r in body] == list(range(10))
+        async with http.get(f"{base}/stream?total=0") as response:
+            assert await response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_errors_before_the_first_page_keep_their_status(serve):
+    errors = {"404": FledgeAPIError(404, "no such asset"), "502": FledgeAPIError(500, "boom"),
+              "503": UpstreamUnavailable("circuit open")}
+
+    async def handler(request):
+        context = ToolContext(FailingClient(errors[request.query["error"]]), request=request)
+        return await handlers.http_response({"name": "get_sensor_data", "parameters": {
+            "sensor_id": "temp", "stream": True}}, context)
+
+    app = web.Application()
+    app.router.add_get("/stream", handler)
+    _, base = await serve(app)
+    async with aiohttp.ClientSession() as http:
+        for status in errors:
+            async with http.get(f"{base}/stream?error={status}") as response:
+                assert response.status == int(status)
+                assert "error" in await response.json()
+
+
+def test_page_size_validation():
+    assert streaming.page_size_from_params({}) == streaming.DEFAULT_PAGE_SIZE
+    with pytest.raises(ValueError):
+        streaming.page_size_from_params({"page_size": 0})
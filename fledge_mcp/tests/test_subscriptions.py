@@ -0,0 +1,95 @@
+"""Tests for the push-based subscription engine."""
+
+import asyncio
+
+import pytest
+
+from fledge_mcp import subscriptions
+from fledge_mcp.subscriptions import SubscriptionManager, NOTIFICATION_METHOD
+
+
+class Subscriber:
+    """Collects notifications; optionally fails like a closed connection."""
+
+    def __init__(self, broken=False):
+        self.received = []
+        self.broken = broken
+
+    async def notify(self, method, params):
+        if self.broken:
+            raise ConnectionError("closed")
+        self.received.append((method, params))
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(subscriptions, "MIN_INTERVAL", 0.01)
+
+
+@pytest.mark.asyncio
+async def test_one_poller_fans_out_to_all_subscribers():
+    calls = []
+
+    async def fetch(sensor_id):
+        calls.append(sensor_id)
+        return {"reading": {"value": len(calls)}}
+
+    manager = SubscriptionManager(fetch)
+    first, second = Subscriber(), Subscriber()
+    manager.subscribe("temp", first, 0.02)
+    manager.subscribe("temp", second, 0.05)
+    await asyncio.sleep(0.1)
+    assert manager.sensors() == ["temp"]
+    assert first.received and second.received
+    assert first.received[0][0] == NOTIFICATION_METHOD
+    assert first.received[0][1]["sensor_id"] == "temp"
+    # both subscribers are served by the same fetches
+    assert len(calls) <= 10
+
+    manager.unsubscribe_all(first)
+    manager.unsubscribe_all(second)
+    assert manager.sensors() == []
+
+
+@pytest.mark.asyncio
+async def test_unchanged_readings_are_not_pushed_again():
+    async def fetch(sensor_id):
+        return {"reading": {"value": 1}}
+
+    manager = SubscriptionManager(fetch)
+    subscriber = Subscriber()
+    manager.subscribe("temp", subscriber, 0.01)
+    await asyncio.sleep(0.08)
+    assert len(subscriber.received) == 1
+    assert manager.unsubscribe("temp", subscriber)
+    assert not manager.unsubscribe("temp", subscriber)
+
+
+@pytest.mark.asyncio
+async def test_broken_subscriber_is_dropped():
+    async def fetch(sensor_id):
+        return {"reading": {"value": 1}}
+
+    manager = SubscriptionManager(fetch)
+    manager.subscribe("temp", Subscriber(broken=True), 0.01)
+    await asyncio.sleep(0.05)
+    assert manager.subscriber_count("temp") == 0
+    assert manager.sensors() == []
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_gets_last_reading_from_a_tracked_task():
+    async def fetch(sensor_id):
+        return {"reading": {"value": 1}}
+
+    manager = SubscriptionManager(fetch)
+    first, late = Subscriber(), Subscriber()
+    manager.subscribe("temp", first, 1)
+    await asyncio.sleep(0.01)
+    manager.subscribe("temp", late, 1)
+    poller = manager._pollers["temp"]
+    assert len(poller.pending) == 1
+    await asyncio.gather(*poller.pending)
+    assert late.received == first.received and not poller.pending
+    manager.unsubscribe_all(first)
+    manager.unsubscribe_all(late)
@@ -0,0 +1,47 @@
+"""Tests for the multi-process worker supervisor."""
+
+import time
+import threading
+
+from fledge_mcp.supervisor import Supervisor
+
+
+def exit_quickly():
+    time.sleep(0.05)
+
+
+def sleep_forever():
+    while True:
+        time.sleep(1)
+
+
+def run_in_thread(supervisor):
+    thread = threading.Thread(target=supervisor.run, kwargs={"install_signals": False}, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_restarts_exited_workers():
+    supervisor = Supervisor(exit_quickly, workers=1, restart_delay=0.01, poll_interval=0.05)
+    thread = run_in_thread(supervisor)
+    deadline = time.monotonic() + 30
+    while supervisor.restarts < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    supervisor.stop()
+    thread.join(30)
+    assert supervisor.restarts >= 2
+    assert not thread.is_alive()
+
+
+def test_stop_terminates_workers():
+    supervisor = Supervisor(sleep_forever, workers=2, shutdown_timeout=5, poll_interval=0.05)
+    thread = run_in_thread(supervisor)
+    deadline = time.monotonic() + 30
+    while not all(p is not None and p.is_alive() for p in supervisor.processes) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    processes = list(supervisor.processes)
+    supervisor.stop()
+    thread.join(30)
+    assert not thread.is_alive()
+    assert all(p is not None and not p.is_alive() for p in processes)
+    assert supervisor.restarts == 0
@@ -0,0 +1,65 @@
+"""Tests for the in-memory sensor ring buffers."""
+
+from fledge_mcp.timeseries import RingBuffer, SensorStore, format_timestamp, parse_timestamp
+
+
+def readings(start, count, step=1):
+    """Fledge-style readings, newest first."""
+    return [
+        {"reading": {"value": float(i), "other": -float(i)}, "timestamp": format_timestamp(1_700_000_000 + i)}
+        for i in range(start + (count - 1) * step, start - 1, -step)
+    ]
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = RingBuffer(3, ["value"])
+    for i in range(5):
+        buffer.append(float(i), (i * 10.0,))
+    assert len(buffer) == 3
+    assert buffer.newest == 4.0
+    assert buffer.latest(5) == [(4.0, (40.0,)), (3.0, (30.0,)), (2.0, (20.0,))]
+    assert buffer.nbytes == 3 * 8 * 2
+
+
+def test_timestamps_round_trip():
+    text = "2024-05-01 12:30:45.123456"
+    assert format_timestamp(parse_timestamp(text)) == text
+
+
+def test_store_answers_fresh_contiguous_windows(clock):
+    store = SensorStore(capacity=10, max_age=5, clock=clock)
+    store.sync("temp", readings(0, 5))
+    assert store.latest("temp", 3) == readings(2, 3)
+    assert store.latest("temp", 6) is None
+
+    # Overlapping fetch extends the series
+    store.sync("temp", readings(3, 4))
+    assert store.latest("temp", 7) == readings(0, 7)
+
+    # A gap resets it to what was fetched
+    store.sync("temp", readings(20, 2))
+    assert store.latest("temp", 3) is None
+    assert store.latest("temp", 2) == readings(20, 2)
+
+    clock.now = 6
+    assert store.latest("temp", 1) is None
+
+
+def test_store_records_ingest_and_goes_stale_on_unknown_timestamps(clock):
+    store = SensorStore(capacity=10, clock=clock)
+    store.sync("temp", readings(0, 2))
+    store.record("temp", format_timestamp(1_700_000_002), {"value": 2.0, "other": -2.0})
+    assert store.latest("temp", 3) == readings(0, 3)
+    store.record("temp", "now", {"value": 3.0, "other": -3.0})
+    assert store.latest("temp", 1) is None
+
+
+def test_non_numeric_readings_are_not_stored_and_memory_is_bounded(clock):
+    store = SensorStore(capacity=100, max_bytes=2 * 10 * 8 * 3, clock=clock)
+    store.sync("text", [{"reading": {"state": "on"}, "timestamp": format_timestamp(0)}])
+    assert store.stats()["sensors"] == 0
+    for sensor in ("a", "b", "c"):
+        store.sync(sensor, readings(0, 10))
+    assert store.stats()["sensors"] == 2
+    assert store.latest("a", 1) is None
+    assert store.latest("c", 1) is not None
@@ -0,0 +1,78 @@
+"""Tests for per-request timing spans and the sampling profiler."""
+
+import json
+import time
+import asyncio
+import threading
+
+import aiohttp
+import pytest
+
+from fledge_mcp import health, main, metrics, tracing
+from fledge_mcp.health import UpstreamProbe
+from fledge_mcp.profiler import SamplingProfiler
+from fledge_mcp.session import Session
+
+
+@pytest.mark.asyncio
+async def test_timing_is_returned_when_requested(socket):
+    session = Session(socket.send, lambda data, session: main.handle_message(data, session=session))
+    before = metrics.span_duration.count(span="handler")
+    await session.dispatch(json.dumps({"jsonrpc": "2.0", "method": "tools/call", "id": 1, "params": {
+        "name": "get_api_schema", "parameters": {}, "_meta": {"timing": True}}}))
+    await session.dispatch(json.dumps({"jsonrpc": "2.0", "method": "tools/call", "id": 2, "params": {
+        "name": "get_api_schema", "parameters": {}}}))
+    await asyncio.gather(*session._tasks)
+    timed, untimed = sorted(socket.sent, key=lambda response: response["id"])
+    assert {"decode", "validate", "admission", "handler", "total"} <= set(timed["timing"])
+    assert timed["timing"]["total"] >= timed["timing"]["handler"] >= 0
+    assert "timing" not in untimed
+    # Spans are aggregated whether or not timing was requested
+    assert metrics.span_duration.count(span="handler") == before + 2
+
+
+def test_spans_accumulate_into_the_current_trace():
+    token = tracing.activate(tracing.Trace())
+    try:
+        trace = tracing.start()
+        with tracing.span("upstream"):
+            time.sleep(0.01)
+        tracing.record("upstream", 0.005)
+        assert trace.spans["upstream"] >= 0.015
+    finally:
+        tracing.deactivate(token)
+    assert tracing.current() is None
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_samples_another_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    worker.start()
+    try:
+        profiler = SamplingProfiler(worker.ident, interval=0.001).run(0.2)
+    finally:
+        stop.set()
+        worker.join()
+    assert profiler.samples > 0
+    assert "busy_loop (test_tracing.py:" in profiler.collapsed()
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_requires_admin_token(serve):
+    _, url = await serve(health.create_app(UpstreamProbe(client=None), admin_token="secret"), "/debug/profile")
+    async with aiohttp.ClientSession() as client:
+        async with client.get(url, headers={"X-Admin-Token": "wrong"}) as response:
+            assert response.status == 403
+        for seconds in ("nan", "inf", "0", "-1", "soon"):
+            async with client.get(f"{url}?seconds={seconds}", headers={"X-Admin-Token": "secret"}) as response:
+                assert response.status == 400
+        async with client.get(f"{url}?seconds=0.1", headers={"X-Admin-Token": "secret"}) as response:
+            assert response.status == 200
+            assert int(response.headers["X-Profile-Samples"]) > 0
+            assert "run_forever" in await response.text()
+    assert "/debug/profile" not in {r.resource.canonical for r in health.create_app(None, admin_token=None).router.routes()}
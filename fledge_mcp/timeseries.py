@@ -0,0 +1,213 @@
+"""
+In-memory store of recent sensor readings.
+
+Each sensor gets a bounded ring buffer holding timestamps and numeric
+datapoints in compact ``array('d')`` columns. The store is filled from
+upstream fetches (tool calls and subscription polling) and from ingested
+readings, and answers recent-window queries without calling Fledge while
+its view of a sensor is fresh and contiguous.
+"""
+
+import os
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+DEFAULT_SENSOR_CAPACITY = int(os.getenv("STORE_SENSOR_CAPACITY", "1000"))
+DEFAULT_MAX_BYTES = int(os.getenv("STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_MAX_AGE = float(os.getenv("STORE_MAX_AGE", "5"))
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def parse_timestamp(value):
+    """Convert a Fledge timestamp string to epoch seconds (naive values are UTC)."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def format_timestamp(seconds):
+    """Convert epoch seconds back to the Fledge timestamp format."""
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def _numeric(values):
+    """Return True if every datapoint value can be stored as a double."""
+    return all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+
+
+class RingBuffer:
+    """Fixed-capacity columnar buffer of timestamps and numeric datapoints."""
+
+    def __init__(self, capacity, datapoints):
+        self.capacity = capacity
+        self.datapoints = tuple(datapoints)
+        self.timestamps = array("d")
+        self.columns = tuple(array("d") for _ in self.datapoints)
+        self.head = 0
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def newest(self):
+        """Timestamp of the newest reading, or None when empty."""
+        if not self.timestamps:
+            return None
+        return self.timestamps[(self.head - 1) % len(self.timestamps)]
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the buffer's columns."""
+        return len(self.timestamps) * 8 * (1 + len(self.columns))
+
+    def append(self, timestamp, values):
+        """Append one reading (values ordered like datapoints), overwriting the oldest when full."""
+        if len(self.timestamps) < self.capacity:
+            self.timestamps.append(timestamp)
+            for column, value in zip(self.columns, values):
+                column.append(value)
+            self.head = len(self.timestamps) % self.capacity
+        else:
+            self.timestamps[self.head] = timestamp
+            for column, value in zip(self.columns, values):
+                column[self.head] = value
+            self.head = (self.head + 1) % self.capacity
+
+    def latest(self, count):
+        """Return up to count (timestamp, values) tuples, newest first."""
+        size = len(self.timestamps)
+        rows = []
+        for k in range(min(count, size)):
+            i = (self.head - 1 - k) % size
+            rows.append((self.timestamps[i], tuple(column[i] for column in self.columns)))
+        return rows
+
+
+class _Series:
+    """Ring buffer plus freshness bookkeeping for one sensor."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.synced_at = None
+
+
+class SensorStore:
+    """Bounded per-sensor ring buffers with a total memory limit."""
+
+    def __init__(self, capacity=DEFAULT_SENSOR_CAPACITY, max_bytes=DEFAULT_MAX_BYTES,
+                 max_age=DEFAULT_MAX_AGE, clock=time.monotonic):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.clock = clock
+        self._series = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.capacity > 0 and self.max_bytes > 0
+
+    def sync(self, sensor_id, readings):
+        """Merge the most recent readings fetched from Fledge (newest first)."""
+        if not self.enabled:
+            return
+        rows = self._parse(readings)
+        if rows is None:
+            self._series.pop(sensor_id, None)
+            return
+        if not rows:
+            return
+        rows.sort(key=lambda row: row[0])
+        datapoints = tuple(sorted(rows[0][1]))
+        series = self._series.get(sensor_id)
+        # Without overlap there may be readings missing between what we hold and what we fetched
+        if series is None or series.buffer.datapoints != datapoints or series.buffer.newest is None \
+                or rows[0][0] > series.buffer.newest:
+            series = _Series(RingBuffer(self.capacity, datapoints))
+            self._series[sensor_id] = series
+        newest = series.buffer.newest
+        for timestamp, values in rows:
+            if newest is None or timestamp > newest:
+                series.buffer.append(timestamp, tuple(values[name] for name in datapoints))
+        series.synced_at = self.clock()
+        self._series.move_to_end(sensor_id)
+        self._enforce_limit(sensor_id)
+
+    def record(self, sensor_id, timestamp, values):
+        """Add an ingested reading to a tracked sensor, keeping the series contiguous."""
+        series = self._series.get(sensor_id)
+        if series is None:
+            return
+        buffer = series.buffer
+        try:
+            seconds = parse_timestamp(timestamp)
+        except (TypeError, ValueError):
+            # Fledge assigns the timestamp ("now"), so our view no longer matches upstream
+            series.synced_at = None
+            return
+        if set(values) != set(buffer.datapoints) or not _numeric(values.values()) \
+                or (buffer.newest is not None and seconds <= buffer.newest):
+            series.synced_at = None
+            return
+        buffer.append(seconds, tuple(values[name] for name in buffer.datapoints))
+
+    def latest(self, sensor_id, limit):
+        """Return the newest readings in Fledge's format, or None if the store cannot answer."""
+        series = self._series.get(sensor_id)
+        if series is None or series.synced_at is None or limit > len(series.buffer) \
+                or self.clock() - series.synced_at > self.max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._series.move_to_end(sensor_id)
+        names = series.buffer.datapoints
+        return [
+            {"reading": dict(zip(names, values)), "timestamp": format_timestamp(timestamp)}
+            for timestamp, values in series.buffer.latest(limit)
+        ]
+
+    def _parse(self, readings):
+        """Return [(epoch seconds, values)] or None if the readings cannot be stored."""
+        rows = []
+        datapoints = None
+        for reading in readings or ():
+            values = reading.get("reading", reading.get("readings")) if isinstance(reading, dict) else None
+            if not isinstance(values, dict) or not _numeric(values.values()):
+                return None
+            if datapoints is None:
+                datapoints = set(values)
+            elif set(values) != datapoints:
+                return None
+            try:
+                rows.append((parse_timestamp(reading["timestamp"]), values))
+            except (KeyError, TypeError, ValueError):
+                return None
+        return rows
+
+    def _enforce_limit(self, keep):
+        """Evict least recently used sensors until the total memory limit is met."""
+        total = sum(series.buffer.nbytes for series in self._series.values())
+        for sensor_id in list(self._series):
+            if total <= self.max_bytes:
+                break
+            if sensor_id == keep:
+                continue
+            total -= self._series.pop(sensor_id).buffer.nbytes
+
+    def stats(self):
+        """Return sensor count, memory use and hit counters."""
+        return {
+            "sensors": len(self._series),
+            "bytes": sum(series.buffer.nbytes for series in self._series.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Shared store for all transports in this process
+sensor_store = SensorStore()
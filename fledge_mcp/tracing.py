@@ -0,0 +1,83 @@
+"""
+Lightweight per-request timing spans.
+
+A ``Trace`` collects the time spent in each named phase of a request
+(decode, validate, admission, handler, upstream, encode, send). The current
+trace lives in a context variable, so spans opened anywhere below a request,
+including in the Fledge client, are attributed to it without passing it
+around. Every span is also observed in the ``fledge_mcp_span_duration_seconds``
+histogram whether or not a trace is active.
+"""
+
+import time
+import contextlib
+import contextvars
+
+from fledge_mcp import metrics
+
+_current = contextvars.ContextVar("fledge_mcp_trace", default=None)
+
+
+class Trace:
+    """Accumulated span durations of one request."""
+
+    __slots__ = ("spans", "started")
+
+    def __init__(self, spans=None, started=None):
+        self.spans = dict(spans or {})
+        self.started = time.perf_counter() if started is None else started
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def timing(self):
+        """Span durations and the total so far, in milliseconds."""
+        timing = {name: round(seconds * 1000, 3) for name, seconds in self.spans.items()}
+        timing["total"] = round((time.perf_counter() - self.started) * 1000, 3)
+        return timing
+
+
+def current():
+    """Return the active trace, if any."""
+    return _current.get()
+
+
+def activate(trace):
+    """Make trace current in this context; returns a token for deactivate()."""
+    return _current.set(trace)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def start():
+    """Begin a trace for a request in the current context, inheriting the enclosing trace's spans."""
+    parent = _current.get()
+    trace = Trace(parent.spans, parent.started) if parent is not None else Trace()
+    _current.set(trace)
+    return trace
+
+
+def requested(params):
+    """Return True if a tools/call asked for its timing via ``_meta.timing``."""
+    meta = params.get("_meta") if isinstance(params, dict) else None
+    return isinstance(meta, dict) and bool(meta.get("timing"))
+
+
+def record(name, seconds):
+    """Attribute an already measured duration to the active trace and the span metrics."""
+    metrics.span_duration.observe(seconds, span=name)
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+@contextlib.contextmanager
+def span(name):
+    """Time the enclosed block as span name."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
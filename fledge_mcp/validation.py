@@ -0,0 +1,64 @@
+"""
+Tool parameter validation.
+
+Each tool's parameter schema (as declared in the tools file) is compiled once
+into a list of small check functions, so validating a call costs the same
+however many tools are registered.
+
+Supported schema keys per parameter: ``type`` (string, integer, number,
+boolean, array, object), ``optional``, ``enum``, ``minimum`` and ``maximum``.
+"""
+
+TYPE_CHECKS = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+
+
+class ValidationError(ValueError):
+    """Raised when tool parameters do not match the tool's schema."""
+
+
+def _compile_param(name, spec):
+    """Return a check function for one parameter."""
+    type_name = spec.get("type")
+    type_check = TYPE_CHECKS.get(type_name)
+    required = not spec.get("optional", False)
+    enum = tuple(spec["enum"]) if "enum" in spec else None
+    minimum = spec.get("minimum")
+    maximum = spec.get("maximum")
+
+    def check(params):
+        value = params.get(name)
+        if value is None:
+            if required:
+                raise ValidationError(f"{name} required")
+            return
+        if type_check is not None and not type_check(value):
+            raise ValidationError(f"{name} must be of type {type_name}")
+        if enum is not None and value not in enum:
+            raise ValidationError(f"{name} must be one of {', '.join(map(str, enum))}")
+        if minimum is not None and value < minimum:
+            raise ValidationError(f"{name} must be >= {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValidationError(f"{name} must be <= {maximum}")
+
+    return check
+
+
+def compile_validator(schema):
+    """Compile a tool's parameter schema into a validator function."""
+    checks = tuple(_compile_param(name, spec) for name, spec in (schema or {}).items())
+
+    def validate(params):
+        if not isinstance(params, dict):
+            raise ValidationError("parameters must be an object")
+        for check in checks:
+            check(params)
+        return params
+
+    return validate
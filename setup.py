@@ -22,17 +22,20 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.9",
     install_requires=requirements,
+    extras_require={
+        "fast": ["orjson>=3.8"],
+    },
     entry_points={
         "console_scripts": [
             "fledge-mcp=fledge_mcp.server:main",
             "fledge-mcp-secure=fledge_mcp.secure_server:main",
+            "fledge-mock=fledge_mcp.mock_fledge:main",
         ],
     },
     include_package_data=True,